@@ -37,3 +37,32 @@ for i in range( 10 ):
     value = daq.Read()
     print( f"{i}: {value}" )
     Wait( "next reading", 10 )
+
+#continuous scanning with device timer, readings are collected in background
+scans = daq.StartContinuousScan( interval=1.0 )
+Wait( "continuous scan", 30 )
+daq.StopContinuousScan()
+print( f"scans: {scans.count}, mean: {scans.Summary()['mean']}" )
+
+#synchronized scanning of two devices, scans are joined by scan number
+from labtoys.Keysight.DAQ_3497xA_group import DAQ_3497xA_Group
+daq2 = DAQ_3497xA( "10.1.0.107" )
+group = DAQ_3497xA_Group( [daq, daq2] )
+print( group.ConfigureChannels( [scanList, scanList] ) )
+group.StartContinuousScan( interval=1.0 )
+print( f"start skew: {group.startSkew} s" )
+Wait( "synchronized scan", 30 )
+group.StopContinuousScan()
+print( group.GetMergedScans( 5 ) )
+
+#alarm limits checked on every block of scans and in device
+for ch in scanList:
+    if( ch.channelType == DAQ_CFG.CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
+        ch.limitHigh = 80.0
+        ch.limitRate = 2.0
+daq.ArmDeviceLimits( scanList, alarmOutput=1 )
+limits = DAQ_CFG.SCAN_LIMITS( scanList )
+limits.AddCallback( lambda events: print( f"ALARM: {events}" ) )
+daq.StartContinuousScan( interval=1.0, limits=limits )
+Wait( "scan with limits", 30 )
+daq.StopContinuousScan()
@@ -0,0 +1,16 @@
+from labtoys.CTS import ASCII_Proto_ETH, ASCII_Proto_ETH_Profile, ProfileSegment, PROFILE_EVENT
+
+chamber = ASCII_Proto_ETH( "10.1.0.110" )
+chamber.StartChamber()
+
+#ramp to 85 C with 2 K/min and hold 30 min after settled, then cool down to 25 C at once
+profile = ASCII_Proto_ETH_Profile( chamber, [ ProfileSegment( 85.0, rate=2.0, soakTime=1800, timeout=3*3600 ),
+                                              ProfileSegment( 25.0, soakTime=600, timeout=3*3600 ) ] )
+profile.AddCallback( lambda event, idx: print( f"{event} segment: {idx}, temp: {chamber.GetMeasuredTemp()}" ) )
+profile.Start()
+
+#test can start as soon as temperature is stable
+if( profile.WaitForEvent( PROFILE_EVENT.SETTLED, 0 ) ):
+    print( "hot test" )
+profile.WaitForEvent( PROFILE_EVENT.PROFILE_FINISHED )
+chamber.StopChamber()
@@ -1,5 +1,7 @@
 from labtoys.DeltaElektronika.PSC_ETH import PSC_ETH
+from labtoys.DeltaElektronika import PSC_sequence
 import time
+import numpy as np
 
 delta = PSC_ETH()
 
@@ -11,22 +13,21 @@ delta.EnableOutput()
 
 time.sleep( 10 )
 
-for i in range( 5 ):
-    for x in range( 13 ):
-        delta.SetOutputVoltage( float(x) )
-        time.sleep( 1 )
-    for x in range( 13 ):
-        delta.SetOutputVoltage( float(12-x) )
-        time.sleep( 1 )
+#5 triangles 0-12-0 V, 26 s each, streamed at 20 Hz over one connection
+times = np.arange( 0.0, 5*26.0, 0.05 )
+voltages = 12.0 - np.abs( ( times % 26.0 ) - 13.0 ) * 12.0 / 13.0
+history = delta.StartTelemetrySampler( period=0.5 )
+delta.StartSetpointStream( times, voltages )
+delta.WaitForSetpointStream()
+delta.StopTelemetrySampler()
+print( f"energy: {delta.GetEnergy()} J, max power: {history.Summary()['max'][2]} W" )
+stats = delta.GetSetpointStreamStatistics()
+print( f"sent: {stats.pointsSent}, skipped: {stats.pointsSkipped}, timing error mean: {stats.meanError} s, max: {stats.maxError} s" )
 
 delta.DisableOutput()
 
-
-
-
-
-
-
-
-
-
+#profile compiled to sequence: ramp 0-12 V in 10 s, hold 10 s and ramp down, max 50 mV error
+times, values = PSC_sequence.SampleLinear( [ (0, 0.0), (10, 12.0), (20, 12.0), (30, 0.0) ], 0.01 )
+steps = PSC_sequence.CompileSequence( times, values, 0.05 )
+print( f"steps: {len(steps)}" )
+print( delta.SyncSequence( "ramp", steps, verify=True ) )
@@ -1,5 +1,6 @@
 #D:\2021\11\29\python_test
 from labtoys.Tektronix.MSO5x import MSO5x
+import time
 
 mso = MSO5x( "10.1.0.10" )
 
@@ -7,6 +8,7 @@ mso = MSO5x( "10.1.0.10" )
 print( mso.GetCurrentWorkingDirectory() )
 
 mso.SaveSession( "test_sesion.tss" )
+mso.DownloadFile( "test_sesion.tss", "test_sesion.tss", progress=lambda done, total: print( f"{done}/{total}", end="\r" ) )
 
 print( mso.GetMeasurementsMean( 1 ) )
 
@@ -19,4 +21,24 @@ print( meas3.minimum )
 print( mso.GetTriggerState() )
 
 meas1 = mso.GetMeasurements(1)
-print( meas1 )
\ No newline at end of file
+print( meas1 )
+
+#all statistics of measurements 1..8 in one query
+meas = mso.GetMeasurementsBulk( list(range(1, 9)) )
+print( meas['mean'] )
+
+#binary download of two channels in one session
+waveforms = mso.GetWaveforms( [MSO5x.WAVEFORM_SOURCE.CH1, MSO5x.WAVEFORM_SOURCE.CH2] )
+for source, wfm in waveforms.items():
+    print( source, len(wfm.volts), wfm.time[-1] )
+
+#mean of measurements 1 and 2 every 0.5 s in background
+history = mso.StartMeasurementSampler( [1, 2], period=0.5 )
+time.sleep( 10 )
+mso.StopMeasurementSampler()
+print( history.Summary()['mean'] )
+
+#capture loop - next download starts as soon as scope finished acquisition
+for i in range( 3 ):
+    if( mso.SingleAndWait( timeout=5.0 ) ):
+        print( mso.GetWaveform( MSO5x.WAVEFORM_SOURCE.CH1 ).volts.max() )
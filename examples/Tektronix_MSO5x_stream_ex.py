@@ -0,0 +1,73 @@
+#CURVEStream example, without scope address it runs against local stand-in which sends synthetic curve blocks
+import socket
+import sys
+import threading
+import time
+import numpy as np
+from labtoys.Tektronix.MSO5x import MSO5x
+
+RECORD_LENGTH = 1000
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def StandIn( server: socket.socket ):
+    conn, addr = server.accept()
+    streaming = False
+    buffer = b''
+    conn.settimeout( 0.01 )
+    while( True ):
+        try:
+            data = conn.recv( 4096 )
+            if( len(data) == 0 ): break
+            buffer += data
+        except socket.timeout:
+            pass
+        except OSError:
+            break
+
+        while( b'\n' in buffer ):
+            line, buffer = buffer.split( b'\n', 1 )
+            answers = []
+            for command in line.decode().split( ';' ):
+                command = command.lstrip( ':' )
+                if( command == "CURVES?" ):
+                    streaming = True
+                elif( command == "*CLS" ):
+                    streaming = False
+                elif( command == "HOR:RECO?" ):
+                    answers.append( str(RECORD_LENGTH) )
+                elif( command.startswith( "WFMO:" ) and command.endswith( "?" ) ):
+                    answers.append( { "BYT_N": "1", "BN_F": "RI", "BYT_O": "MSB", "NR_P": str(RECORD_LENGTH),
+                                      "XIN": "1.0E-9", "XZE": "0.0", "PT_O": "0", "YMU": "0.04", "YOF": "0",
+                                      "YZE": "0.0", "XUN": "\"s\"", "YUN": "\"V\"" }[ command[5:-1] ] )
+            if( len(answers) > 0 ):
+                conn.sendall( (";".join( answers ) + "\n").encode() )
+
+        if( streaming ):
+            phase = time.perf_counter()
+            curve = ( 100 * np.sin( np.linspace( 0, 4*np.pi, RECORD_LENGTH ) + phase ) ).astype( '>i1' ).tobytes()
+            length = str( len(curve) )
+            try:
+                conn.sendall( b"#" + str(len(length)).encode() + length.encode() + curve + b"\n" )
+            except OSError:
+                break
+    conn.close()
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+if( len(sys.argv) > 1 ):
+    mso = MSO5x( sys.argv[1] )
+else:
+    server = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+    server.bind( ("127.0.0.1", 0) )
+    server.listen( 1 )
+    threading.Thread( target=StandIn, args=(server,), daemon=True ).start()
+    mso = MSO5x( "127.0.0.1", server.getsockname()[1] )
+
+print( mso.StartCurveStream( capacity=50 ) )
+for i in range( 5 ):
+    time.sleep( 1 )
+    frames = mso.GetCurveStreamFrames()
+    stats = mso.GetCurveStreamStatistics()
+    print( f"frames: {len(frames)}, rate: {stats.frameRate:.1f} 1/s, throughput: {stats.throughput/1e6:.2f} MB/s, dropped: {stats.droppedFrames}" )
+    if( len(frames) > 0 ):
+        print( mso.GetCurveStreamPreamble().Volts( frames[-1] )[:5] )
+mso.StopCurveStream()
@@ -2,15 +2,14 @@ from labtoys.logger import Logger
 import time
 from random import random
 
-log = Logger( "test\\test.csv" )
-log.includeIdx = True
-log.includeTimeFromStart = True
+#file is flushed every 10 lines, 64 kB or 5 s and closed on exit of with block
+with Logger( "test\\test.csv" ) as log:
+    log.includeIdx = True
+    log.includeTimeFromStart = True
 
-log.MakeHeaders( ["i", "Test1", "Test2", "Test3"] )
+    log.MakeHeaders( ["i", "Test1", "Test2", "Test3"] )
 
-for i in range(100):
-    log.Log( [i, random(), int( random() * 100 ), "test_" + str(i) ] )
-    time.sleep( 5 )
-    print( "Log: " + str(i) )
-
-log.CloseFile()
\ No newline at end of file
+    for i in range(100):
+        log.Log( [i, random(), int( random() * 100 ), "test_" + str(i) ] )
+        time.sleep( 5 )
+        print( "Log: " + str(i) )
\ No newline at end of file
@@ -12,6 +12,11 @@
 #      		- Initial class
 #       -2021.11.08     version: 0.1.1
 #           - update functions to assign return type
+#       -2026.10.19     version: 0.2.0
+#           - Status snapshot (A0 and U1 on one connection) with short time cache for getters
+#       -2026.10.19     version: 0.2.1
+#           - Snapshot is cached also without gradients (chambers without U1), gradients are nan then
+#           - U1 is not send anymore when chamber did not answer it in first snapshot (readGradients)
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:
@@ -22,6 +27,9 @@
 #           
 
 from ..scpi import SCPI_Socket
+import math
+import threading
+import time
 
 class ASCII_Proto_ETH:
     def __init__( self, ip, port=1080 ):
@@ -30,22 +38,87 @@ class ASCII_Proto_ETH:
         self.__device.lineEnding = ""
         self.__device.sendDalay = 0.005
 
+        self.cacheTime = 0.5                            #[s] max age of snapshot used by getters, 0 - always read
+        self.readGradients = None                       #U1 in snapshot, None - detected with first snapshot (False when not answered)
+        self.__snapshot = None
+        self.__snapshotLock = threading.Lock()
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    class Snapshot:
+        #all values read together, nan when reading failed (gradients also for chambers without gradient support)
+
+        def __init__( self ):
+            self.timestamp = time.monotonic()
+            self.measuredTemp = float( 'nan' )
+            self.setTemp = float( 'nan' )
+            self.gradientUp = float( 'nan' )
+            self.gradientDown = float( 'nan' )
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def age( self ) -> float:
+            return time.monotonic() - self.timestamp
+
+        #------------------------------------------------------------------------------------------
+        def IsValid( self ) -> bool:
+            #temperatures are read, gradients are optional
+            return not math.isnan( self.measuredTemp )
+
+    #----------------------------------------------------------------------------------------------
+    def __ReadPair( self, command: str, connIdx: int ) -> tuple:
+        #replies of A0 and U1 have fixed width: "A0 023.4 025.0" - two values on positions 3:8 and 9:14
+        if( self.__device.SendCommand( command, connIdx=connIdx ) != connIdx ): return ( float( 'nan' ), float( 'nan' ) )
+        respond = self.__device.GetExact( 14, connIdx=connIdx ).decode( "ASCII", errors="replace" )
+        try:
+            return ( float( respond[3:8] ), float( respond[9:14] ) )
+        except ValueError:
+            return ( float( 'nan' ), float( 'nan' ) )
+
+    #--------------------------------------------
+    def ReadSnapshot( self ) -> Snapshot:
+        #temperatures (A0) and gradients (U1) read on one connection, result is stored for getters
+        snapshot = self.Snapshot()
+        connIdx = self.__device.Connect()
+        if( connIdx != -1 ):
+            snapshot.measuredTemp, snapshot.setTemp = self.__ReadPair( "A0", connIdx )
+            #chamber without gradients does not answer U1, every snapshot would wait for timeout
+            if( snapshot.IsValid()
+                and self.readGradients != False ):
+                snapshot.gradientUp, snapshot.gradientDown = self.__ReadPair( "U1", connIdx )
+                if( self.readGradients == None ):
+                    self.readGradients = not math.isnan( snapshot.gradientUp )
+            self.__device.Close( connIdx )
+        if( snapshot.IsValid() ):
+            self.__snapshot = snapshot
+        return snapshot
+
+    #--------------------------------------------
+    def GetSnapshot( self, maxAge: float=None ) -> Snapshot:
+        #last snapshot when it is not older than maxAge [s] (None - cacheTime), otherwise new one is read
+        if( maxAge == None ):
+            maxAge = self.cacheTime
+        with self.__snapshotLock:
+            snapshot = self.__snapshot
+            if( snapshot != None
+                and snapshot.age <= maxAge ):
+                return snapshot
+            return self.ReadSnapshot()
+
+    #--------------------------------------------
+    def InvalidateSnapshot( self ):
+        self.__snapshot = None
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     def GetMeasuredTemp( self ) -> float:
-        respond = self.__device.SendCommandGetAns( "A0", respondLength=14 )
-        if( len( respond ) == 0 ):  return float('nan')
-        value = float( respond[3:8] )
-        return value
+        return self.GetSnapshot().measuredTemp
 
     #----------------------------------------------------------------------------------------------
     def ReadSetTemp( self ) -> float:
-        respond = self.__device.SendCommandGetAns( "A0", respondLength=14 )
-        if( len( respond ) == 0  ):  return float('nan')
-        value = float( respond[9:14] )
-        return value
+        return self.GetSnapshot().setTemp
 
     #----------------------------------------------------------------------------------------------
     def SetTemp( self, temp: float ) -> bool:
+        self.InvalidateSnapshot()
         respond = self.__device.SendCommandGetAns( "a0 " + "{0:3.1f}".format(temp).zfill(5), respondLength=1 )
         if( len( respond ) == 0 
             and (respond != "A" and respond != "a") ):
@@ -70,16 +143,10 @@ class ASCII_Proto_ETH:
 
     #------------------------------------------------------------------------------------------------------------------------------------------------
     def ReadGradientUp( self ) -> float:
-        respond = self.__device.SendCommandGetAns( "U1", respondLength=14 )
-        if( len( respond ) == 0  ):  return float('nan')
-        value = float( respond[3:8] )
-        return value
+        return self.GetSnapshot().gradientUp
 
     #----------------------------------------------------------------------------------------------
     def ReadGradientDown( self ) -> float:
-        respond = self.__device.SendCommandGetAns( "U1", respondLength=14 )
-        if( len( respond ) == 0  ):  return float('nan')
-        value = float( respond[9:14] )
-        return value
+        return self.GetSnapshot().gradientDown
     
 
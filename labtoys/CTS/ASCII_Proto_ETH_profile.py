@@ -0,0 +1,228 @@
+#ASCII_Proto_ETH_profile.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Temperature profile (ramps and soaks) executed on CTS climate chamber with detection of stable temperature
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class
+#       -2026.10.19     version: 0.1.1
+#           - Fix ramp stopping 0.1 K before target (float comparison of set temperature steps)
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#           - humidity profiles for chambers with humidity control
+#
+#       Usefull information and links:
+#           ASCII protocol desription:  https://www.cts-umweltsimulation.de/en/component/emdown/downloadfile/10565.html?id=10565&Itemid=358     (2021.11.06)
+#
+
+from .ASCII_Proto_ETH import ASCII_Proto_ETH
+from ..buffers import TimeSeriesBuffer
+import numpy as np
+import threading
+import time
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class PROFILE_EVENT:
+    SEGMENT_STARTED     = 'SEGMENT_STARTED'
+    RAMP_DONE           = 'RAMP_DONE'                   #set temperature reached target of segment
+    SETTLED             = 'SETTLED'                     #measured temperature is stable at target, soak time starts
+    SEGMENT_FINISHED    = 'SEGMENT_FINISHED'
+    TIMEOUT             = 'TIMEOUT'                     #segment not settled in its timeout, profile is stopped
+    STOPPED             = 'STOPPED'                     #profile stopped with Stop
+    PROFILE_FINISHED    = 'PROFILE_FINISHED'
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class ProfileSegment:
+
+    def __init__( self, target: float, rate: float=None, soakTime: float=0.0, timeout: float=None ):
+        self.target = target                            #[C]
+        self.rate = rate                                #[K/min] of set temperature ramp, None - target set at once
+        self.soakTime = soakTime                        #[s] hold time after temperature is settled
+        self.timeout = timeout                          #[s] max time from start of segment to settled, None - no limit
+
+        #settled when in last window: |mean - target| <= tolerance, |slope| <= maxSlope and std <= maxStd
+        self.window = 120.0                             #[s]
+        self.tolerance = 0.5                            #[K]
+        self.maxSlope = 0.1                             #[K/min]
+        self.maxStd = 0.1                               #[K]
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class ASCII_Proto_ETH_Profile:
+    #segments are executed in background thread, progress is reported with events (PROFILE_EVENT)
+    #chamber is polled often near target (minPeriod) and rarely when temperature is far from it (maxPeriod)
+
+    def __init__( self, chamber: ASCII_Proto_ETH, segments: list, minPeriod: float=2.0, maxPeriod: float=15.0, capacity: int=100000 ):
+        self.__chamber = chamber
+        self.__segments = list( segments )
+        self.minPeriod = minPeriod                      #[s]
+        self.maxPeriod = maxPeriod                      #[s]
+        self.__history = TimeSeriesBuffer( capacity, [ 'measuredTemp', 'setTemp', 'segment' ] )
+
+        self.__events = []                              #(time.time(), PROFILE_EVENT, segment idx)
+        self.__eventsCondition = threading.Condition()
+        self.__callbacks = []
+        self.__thread = None
+        self.__stop = threading.Event()
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def segments( self ) -> list:
+        return self.__segments
+
+    @property
+    def history( self ) -> TimeSeriesBuffer:
+        #measured and set temperature of every poll, time from time.time()
+        return self.__history
+
+    @property
+    def events( self ) -> list:
+        with self.__eventsCondition:
+            return list( self.__events )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def AddCallback( self, function ):
+        #function( event: PROFILE_EVENT, segmentIdx: int ) called from profile thread
+        self.__callbacks.append( function )
+
+    #--------------------------------------------
+    def __Emit( self, event: PROFILE_EVENT, segmentIdx: int ):
+        with self.__eventsCondition:
+            self.__events.append( ( time.time(), event, segmentIdx ) )
+            self.__eventsCondition.notify_all()
+        for function in list( self.__callbacks ):
+            function( event, segmentIdx )
+
+    #--------------------------------------------
+    def WaitForEvent( self, event: PROFILE_EVENT, segmentIdx: int=None, timeout: float=None ) -> bool:
+        #True when event (of segment or any segment when segmentIdx is None) happened, also before call
+        #returns False on timeout or when profile ended without this event
+        def Happened() -> bool:
+            return any( e == event and ( segmentIdx == None or idx == segmentIdx ) for t, e, idx in self.__events )
+        def Ended() -> bool:
+            return any( e in ( PROFILE_EVENT.PROFILE_FINISHED, PROFILE_EVENT.STOPPED, PROFILE_EVENT.TIMEOUT ) for t, e, idx in self.__events )
+
+        with self.__eventsCondition:
+            self.__eventsCondition.wait_for( lambda: Happened() or Ended(), timeout )
+            return Happened()
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def Start( self ) -> bool:
+        if( self.IsRunning() ): return False
+        with self.__eventsCondition:
+            self.__events = []
+        self.__stop.clear()
+        self.__thread = threading.Thread( target=self.__Run, daemon=True )
+        self.__thread.start()
+        return True
+
+    #--------------------------------------------
+    def Stop( self, timeout: float=None ) -> bool:
+        #set temperature stays as it was, chamber is not stopped
+        if( self.__thread == None ): return False
+        self.__stop.set()
+        self.__thread.join( timeout )
+        return not self.__thread.is_alive()
+
+    #--------------------------------------------
+    def IsRunning( self ) -> bool:
+        return ( self.__thread != None
+                and self.__thread.is_alive() )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def IsSettled( segment: ProfileSegment, times: np.ndarray, temps: np.ndarray ) -> bool:
+        #window has to be covered by samples, slope from least squares line
+        if( len(times) < 3
+            or times[-1] - times[0] < 0.9 * segment.window ):
+            return False
+        slope = np.polyfit( times - times[0], temps, 1 )[0] * 60                                    #[K/min]
+        return ( abs( np.mean( temps ) - segment.target ) <= segment.tolerance
+                and abs( slope ) <= segment.maxSlope
+                and np.std( temps ) <= segment.maxStd )
+
+    #--------------------------------------------
+    def __Run( self ):
+        for idx, segment in enumerate( self.__segments ):
+            result = self.__RunSegment( idx, segment )
+            if( result != PROFILE_EVENT.SEGMENT_FINISHED ):
+                self.__Emit( result, idx )
+                return
+        self.__Emit( PROFILE_EVENT.PROFILE_FINISHED, len(self.__segments) - 1 )
+
+    #--------------------------------------------
+    def __RunSegment( self, idx: int, segment: ProfileSegment ) -> PROFILE_EVENT:
+        self.__Emit( PROFILE_EVENT.SEGMENT_STARTED, idx )
+        startTime = time.monotonic()
+        snapshot = self.__chamber.ReadSnapshot()
+        rampStart = snapshot.measuredTemp if np.isnan( snapshot.setTemp ) else snapshot.setTemp
+        setTemp = None                                  #last send set temperature in tenths of degree
+        rampDone = False
+        settledTime = None
+        times = np.empty( 0 )
+        temps = np.empty( 0 )
+
+        while( True ):
+            now = time.monotonic()
+            if( segment.timeout != None
+                and settledTime == None
+                and now - startTime > segment.timeout ):
+                return PROFILE_EVENT.TIMEOUT
+
+            #set temperature of ramp, changed by at least 0.1 K (resolution of chamber)
+            if( not rampDone ):
+                target = segment.target
+                if( segment.rate != None and not np.isnan( rampStart ) ):
+                    change = segment.rate / 60 * ( now - startTime )
+                    target = min( segment.target, rampStart + change ) if segment.target >= rampStart else max( segment.target, rampStart - change )
+                #compared in integer tenths of degree, float difference of 0.1 K steps is not exact
+                target = round( target * 10 )
+                if( setTemp != target ):
+                    if( self.__chamber.SetTemp( target / 10 ) ):
+                        setTemp = target
+                if( setTemp == round( segment.target * 10 ) ):
+                    rampDone = True
+                    self.__Emit( PROFILE_EVENT.RAMP_DONE, idx )
+
+            snapshot = self.__chamber.ReadSnapshot()
+            self.__history.AppendSample( time.time(), ( snapshot.measuredTemp, snapshot.setTemp, idx ) )
+
+            #only samples after ramp and from last window are used for settle detection
+            if( rampDone and not np.isnan( snapshot.measuredTemp ) ):
+                times = np.append( times, now )
+                temps = np.append( temps, snapshot.measuredTemp )
+                keep = times >= now - segment.window
+                times = times[keep]
+                temps = temps[keep]
+                if( settledTime == None
+                    and self.IsSettled( segment, times, temps ) ):
+                    settledTime = now
+                    self.__Emit( PROFILE_EVENT.SETTLED, idx )
+            if( settledTime != None
+                and now - settledTime >= segment.soakTime ):
+                self.__Emit( PROFILE_EVENT.SEGMENT_FINISHED, idx )
+                return PROFILE_EVENT.SEGMENT_FINISHED
+
+            if( self.__stop.wait( self.__PollPeriod( segment, rampDone, settledTime, snapshot.measuredTemp ) ) ):
+                return PROFILE_EVENT.STOPPED
+
+    #--------------------------------------------
+    def __PollPeriod( self, segment: ProfileSegment, rampDone: bool, settledTime: float, measuredTemp: float ) -> float:
+        #ramp - often enough to change set temperature by 0.1 K
+        #soak - rare polls, only end of soak time is waited for
+        #settling - often when close to target (window needs samples), rare when far
+        if( not rampDone ):
+            if( segment.rate == None or segment.rate <= 0 ): return self.minPeriod
+            return min( max( 0.1 / ( segment.rate / 60 ), self.minPeriod ), self.maxPeriod )
+        if( settledTime != None ):
+            remaining = segment.soakTime - ( time.monotonic() - settledTime )
+            return min( max( remaining, 0.0 ), self.maxPeriod )
+        if( np.isnan( measuredTemp )
+            or abs( measuredTemp - segment.target ) > 3 * segment.tolerance ):
+            return self.maxPeriod
+        return min( self.minPeriod, segment.window / 10 )
@@ -1,3 +1,4 @@
 #__init__.py
 
-from .ASCII_Proto_ETH import ASCII_Proto_ETH
\ No newline at end of file
+from .ASCII_Proto_ETH import ASCII_Proto_ETH
+from .ASCII_Proto_ETH_profile import ASCII_Proto_ETH_Profile, ProfileSegment, PROFILE_EVENT
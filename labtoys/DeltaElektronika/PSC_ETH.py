@@ -16,6 +16,21 @@
 #           - Add functions to upload sequence to delta
 #       -2021.10.30     version: 0.2.2
 #           - Modify functions to set remote status
+#       -2026.10.19     version: 0.3.0
+#           - SendSequence uploads all steps in large writes over one connection, optional verification by read back
+#           - Fix __SetSequenceStep not using given connection and SendSequence leaving connection open on error
+#       -2026.10.19     version: 0.3.1
+#           - GetCompleteSequence sends step queries in batches and reads replies from one stream
+#       -2026.10.19     version: 0.4.0
+#           - Cache of uploaded sequences and SyncSequence - only changed steps and new END are written
+#       -2026.10.19     version: 0.5.0
+#           - Setpoint streaming - voltage/current points send on schedule over one connection with timing statistics
+#       -2026.10.19     version: 0.6.0
+#           - Telemetry (voltage, current, output, digital inputs) in one exchange and background sampler with power and energy
+#       -2026.10.19     version: 0.6.1
+#           - Output switching in two steps - prepare connection and switch (for synchronized switching of many devices)
+#       -2026.10.19     version: 0.6.2
+#           - Energy of telemetry sampler integrated with monotonic clock, change of system time does not affect it
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:
@@ -28,14 +43,37 @@
 #
 
 from ..scpi import SCPI_Socket
+from ..buffers import TimeSeriesBuffer
+from ..periodic import PeriodicWorker
 from enum import Enum
+import numpy as np
+import threading
+import time
 
 class PSC_ETH:
+    SEQUENCE_MAX_STEPS = 2000
+
     def __init__( self, aIP="10.1.0.101", aPort=8462 ):
         self.__device = SCPI_Socket( aIP, aPort )
         self.__device.timeout = 3
         self.__device.sendDalay = 0.005
 
+        #steps (without END) of sequences known to be in device, name -> list of normalized steps
+        self.__sequenceCache = {}
+        self.__selectedSequence = None
+
+        self.__streamThread = None
+        self.__streamStop = threading.Event()
+        self.__streamStatistics = None
+
+        self.__sampler = None
+        self.__samplerConnIdx = 0
+        self.__samplerHistory = None
+        self.__samplerLast = None                       #(time, power) of last sample for energy integration
+        self.__samplerEnergy = 0.0
+
+        self.__switchConnIdx = 0
+
     #----------------------------------------------------------------------------------------------
     # General Instructions
     #----------------------------------------------------------------------------------------------
@@ -130,6 +168,38 @@ class PSC_ETH:
         if( len( ans ) == 0 ): return float( 'nan' )
         return float( ans )
 
+    #--------------------------------------------
+    def __GetTelemetry( self, connIdx: int ) -> list:
+        #all queries in one write, replies read one by one from stream
+        queries = [ "MEAS:VOLT?", "MEAS:CURR?", "OUTP?", "UINP:COND?" ]                             #MEASure:VOLTage, CURRent, OUTPut, UINPut:CONDition
+        if( self.__SendLines( queries, connIdx, 16384 ) == False ): return [ float( 'nan' ), float( 'nan' ), False, -2147483648 ]
+        answers = [ self.__device.GetLine( connIdx=connIdx ) for query in queries ]
+        try:
+            voltage = float( answers[0] )
+        except ValueError:
+            voltage = float( 'nan' )
+        try:
+            current = float( answers[1] )
+        except ValueError:
+            current = float( 'nan' )
+        try:
+            output = int( answers[2] ) != 0
+        except ValueError:
+            output = False
+        try:
+            inputs = int( answers[3] )
+        except ValueError:
+            inputs = -2147483648       #int32 min
+        return [ voltage, current, output, inputs ]
+
+    def GetTelemetry( self ) -> list:
+        #[ output voltage, output current, output enabled, digital inputs ] measured together
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return [ float( 'nan' ), float( 'nan' ), False, -2147483648 ]
+        res = self.__GetTelemetry( connIdx )
+        self.__device.Close( connIdx )
+        return res
+
     #--------------------------------------------
     #commented as it's only avaibale in firmware version 3.4.0 - other on tested device
     #def MeasureOutputPower( self ) -> float:
@@ -264,6 +334,29 @@ class PSC_ETH:
     def DisableOutput( self ) -> bool:
         return self.__device.SendCommand( "OUTP 0" ) == 0                                           #OUTPut
 
+    #--------------------------------------------
+    def PrepareOutputSwitch( self ) -> bool:
+        #opens connection for SwitchPreparedOutput, so switching costs only sending of command
+        if( self.__switchConnIdx != 0 ): return True
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+        self.__switchConnIdx = connIdx
+        return True
+
+    def SwitchPreparedOutput( self, enable: bool ) -> bool:
+        #enables/disables output on connection from PrepareOutputSwitch and closes it
+        if( self.__switchConnIdx == 0 ): return False
+        connIdx = self.__switchConnIdx
+        self.__switchConnIdx = 0
+        status = self.__device.SendCommand( "OUTP 1" if enable else "OUTP 0", connIdx=connIdx ) == connIdx  #OUTPut
+        self.__device.Close( connIdx )
+        return status
+
+    def CancelOutputSwitch( self ):
+        if( self.__switchConnIdx == 0 ): return
+        self.__device.Close( self.__switchConnIdx )
+        self.__switchConnIdx = 0
+
     #--------------------------------------------
     def GetOutputStatus( self ) -> bool:
         ans = self.__device.SendCommandGetAns( "OUTP?" )                                            #OUTPut
@@ -286,6 +379,7 @@ class PSC_ETH:
     def __SelectSequence( self, name: str, connIdx: int ) -> bool:
         if( len(name) > 16 ):
             name = name[:16]
+        self.__selectedSequence = name
         return self.__device.SendCommand( "PROG:SEL:NAME " + name, connIdx=connIdx ) == connIdx     #PROGram:SELected:NAME
 
     def SelectSequence( self, name: str ) -> bool:
@@ -298,9 +392,10 @@ class PSC_ETH:
         return str( ans )
 
     #--------------------------------------------
-    def __SetSequenceStep( self, stepNo: int, command: str, connIdx: str ) -> bool:
-        if( (stepNo <= 2000) and (stepNo >= 1) ):
-            return self.__device.SendCommand( "PROG:SEL:STEP " + str(stepNo) + " " + command ) == connIdx   #PROGram:SELected:STEP
+    def __SetSequenceStep( self, stepNo: int, command: str, connIdx: int ) -> bool:
+        if( (stepNo <= self.SEQUENCE_MAX_STEPS) and (stepNo >= 1) ):
+            self.__sequenceCache.pop( self.__selectedSequence, None )
+            return self.__device.SendCommand( "PROG:SEL:STEP " + str(stepNo) + " " + command, connIdx=connIdx ) == connIdx   #PROGram:SELected:STEP
         else:
             return False
 
@@ -318,27 +413,44 @@ class PSC_ETH:
         return ""
 
     def GetSequenceStep( self, stepNo: int ) -> str:
-        return self.__GetSequenceStep( self, stepNo, 0 )
+        return self.__GetSequenceStep( stepNo, 0 )
         
     #--------------------------------------------
-    def GetCompleteSequence( self ) -> list:
+    def __GetCompleteSequence( self, connIdx: int, batchSize: int ) -> list:
         #ans = self.__device.SendCommandGetAns( "PROG:SEL:STEP ?" )                                 #PROGram:SELected:STEP          <- this is not working, return only first step
+        #queries of batch go in one write and replies are read line by line, batch grows up to batchSize
+        #replies for steps after END are read too, so stream stays in sync
         idx = 1
-        step = ""
         steps = []
+        batch = min( 16, batchSize )
+        while( idx <= self.SEQUENCE_MAX_STEPS + 1 ):
+            count = min( batch, self.SEQUENCE_MAX_STEPS + 2 - idx )
+            queries = [ "PROG:SEL:STEP " + str(stepNo) + "?" for stepNo in range( idx, idx+count ) ]  #PROGram:SELected:STEP
+            if( self.__SendLines( queries, connIdx, 16384 ) == False ): return steps
+
+            finished = False
+            for i in range( count ):
+                ans = self.__device.GetLine( connIdx=connIdx )
+                if( len( ans ) == 0 ): return steps
+                if( finished ): continue
+                pos = ans.find( ' ' )
+                steps.append( ans[(pos+1):] )
+                finished = steps[-1] == "END"
+            if( finished ): break
+            idx += count
+            batch = min( 2*batch, batchSize )
+        return steps
+
+    def GetCompleteSequence( self, batchSize: int=100 ) -> list:
         connIdx = self.__device.Connect()
         if( connIdx == -1 ): return []
-        while( step != "END" ):
-            step = self.__GetSequenceStep( idx, connIdx )
-            if( len( step ) == 0 ):
-                break
-            steps.append( step )
-            idx = idx + 1
+        steps = self.__GetCompleteSequence( connIdx, batchSize )
         self.__device.Close( connIdx )
         return steps
 
     #--------------------------------------------
     def __DeleteSelectedSequence( self, connIdx: int ) -> bool:
+        self.__sequenceCache.pop( self.__selectedSequence, None )
         return self.__device.SendCommand( "PROG:SEL:DEL", connIdx=connIdx ) == connIdx              #PROGram:SELected:DELete
 
     def DeleteSelectedSequence( self ) -> bool:
@@ -394,20 +506,286 @@ class PSC_ETH:
         return self.__device.SendCommand( "TRIG:IMM" ) == 0                                         #TRIGger:IMMediate
         
     #--------------------------------------------
-    def SendSequence( self, name : str, steps : list ) -> bool:
+    def __SendLines( self, lines: list, connIdx: int, chunkSize: int ) -> bool:
+        #commands joined in writes of about chunkSize bytes, send delay is paid once per write not per command
+        chunk = []
+        length = 0
+        for line in lines:
+            chunk.append( line + self.__device.lineEnding )
+            length += len( chunk[-1] )
+            if( length >= chunkSize ):
+                if( self.__device.SendRaw( "".join( chunk ).encode( "UTF-8" ), connIdx=connIdx ) != connIdx ): return False
+                chunk = []
+                length = 0
+        if( len(chunk) > 0 ):
+            return self.__device.SendRaw( "".join( chunk ).encode( "UTF-8" ), connIdx=connIdx ) == connIdx
+        return True
+
+    #--------------------------------------------
+    @staticmethod
+    def __NormalizeStep( step: str ) -> str:
+        return " ".join( step.split() ).upper()
+
+    #--------------------------------------------
+    def SendSequence( self, name : str, steps : list, verify: bool=False, chunkSize: int=16384 ) -> bool:
+        #sequence is deleted and uploaded again, all steps go in a few large writes over one connection
+        #verify - steps are read back and compared with uploaded (without white spaces and case differences)
+        if( len(steps) > self.SEQUENCE_MAX_STEPS ): return False
+        if( len(name) > 16 ):
+            name = name[:16]
+
         connIdx = self.__device.Connect()
         if( connIdx == -1 ): return False
 
-        #delete current sequence with the same name
-        if( self.__SelectSequence( name, connIdx ) == False ): return False
-        if( self.__DeleteSelectedSequence( connIdx ) == False ): return False
+        #delete current sequence with the same name, select sequence again and upload new sequence
+        lines = [ "PROG:SEL:NAME " + name, "PROG:SEL:DEL", "PROG:SEL:NAME " + name ]                #PROGram:SELected:NAME, DELete
+        lines += [ "PROG:SEL:STEP " + str(i+1) + " " + step for i, step in enumerate( steps ) ]     #PROGram:SELected:STEP
+        self.__selectedSequence = name
+        self.__sequenceCache.pop( name, None )
+        status = self.__SendLines( lines, connIdx, chunkSize )
+        if( status and verify ):
+            status = self.__VerifySequence( steps, connIdx )
+        if( status ):
+            self.__sequenceCache[name] = self.__NormalizeSteps( steps )
 
-        #select sequence again and upload new sequence
-        if( self.__SelectSequence( name, connIdx ) == False ): return False
-        for i in range( len(steps) ):
-            if( self.__SetSequenceStep(i+1, steps[i], connIdx) == False ): return False
+        self.__device.Close( connIdx )
+        return status
+
+    #--------------------------------------------
+    def __NormalizeSteps( self, steps: list ) -> list:
+        #steps to compare, without END on the end
+        steps = [ self.__NormalizeStep( step ) for step in steps ]
+        if( len(steps) > 0 and steps[-1] == "END" ):
+            steps = steps[:-1]
+        return steps
+
+    #--------------------------------------------
+    def __VerifySequence( self, steps: list, connIdx: int ) -> bool:
+        return self.__NormalizeSteps( self.__GetCompleteSequence( connIdx, 100 ) ) == self.__NormalizeSteps( steps )
+
+    #--------------------------------------------
+    def SyncSequence( self, name: str, steps: list, useCache: bool=True, verify: bool=False, chunkSize: int=16384 ) -> bool:
+        #writes only steps which differ from sequence in device and END on new position
+        #stored steps are taken from cache of last SendSequence/SyncSequence or read from device (useCache=False or not in cache)
+        #when all steps would be written anyway, sequence is uploaded from scratch with SendSequence
+        if( len(steps) > self.SEQUENCE_MAX_STEPS ): return False
+        if( len(name) > 16 ):
+            name = name[:16]
+        desired = self.__NormalizeSteps( steps )
+
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+        if( self.__SelectSequence( name, connIdx ) == False ):
+            self.__device.Close( connIdx )
+            return False
+
+        stored = self.__sequenceCache.get( name ) if useCache else None
+        if( stored == None ):
+            stored = self.__NormalizeSteps( self.__GetCompleteSequence( connIdx, 100 ) )
+
+        lines = [ "PROG:SEL:STEP " + str(i+1) + " " + step for i, step in enumerate( steps[:len(desired)] )   #PROGram:SELected:STEP
+                    if i >= len(stored) or desired[i] != stored[i] ]
+        if( len(desired) != len(stored)
+            and len(desired) < self.SEQUENCE_MAX_STEPS ):
+            lines.append( "PROG:SEL:STEP " + str(len(desired)+1) + " END" )
+
+        #full upload costs delete and select commands and all steps
+        fullLength = sum( len(step) for step in steps ) + len(steps) * len( "PROG:SEL:STEP 0000 " ) + 2 * len( name ) + 40
+        if( sum( len(line) for line in lines ) >= fullLength ):
+            self.__device.Close( connIdx )
+            return self.SendSequence( name, steps, verify, chunkSize )
+
+        self.__sequenceCache.pop( name, None )
+        status = self.__SendLines( lines, connIdx, chunkSize )
+        if( status and verify ):
+            status = self.__VerifySequence( steps, connIdx )
+        if( status ):
+            self.__sequenceCache[name] = desired
 
         self.__device.Close( connIdx )
+        return status
+
+    #--------------------------------------------
+    def InvalidateSequenceCache( self, name: str=None ):
+        #use when sequence was changed outside of this object (front panel, other program), None - all sequences
+        if( name == None ):
+            self.__sequenceCache.clear()
+        else:
+            self.__sequenceCache.pop( name[:16], None )
+
+    #----------------------------------------------------------------------------------------------
+    # Setpoint streaming
+    #----------------------------------------------------------------------------------------------
+    class SetpointStreamStatistics:
+
+        def __init__( self, length: int ):
+            self.pointsSent = 0
+            self.pointsSkipped = 0                  #points not send as next point was already due
+            self.sendErrors = 0
+            self.timingErrors = np.full( length, np.nan )   #[s] send time - scheduled time of every point, nan - skipped
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def meanError( self ) -> float:
+            if( self.pointsSent == 0 ): return float( 'nan' )
+            return float( np.nanmean( self.timingErrors ) )
+
+        #-----------------------------------------------------------------
+        @property
+        def maxError( self ) -> float:
+            if( self.pointsSent == 0 ): return float( 'nan' )
+            return float( np.nanmax( self.timingErrors ) )
+
+        #-----------------------------------------------------------------
+        @property
+        def stdError( self ) -> float:
+            if( self.pointsSent == 0 ): return float( 'nan' )
+            return float( np.nanstd( self.timingErrors ) )
+
+    #--------------------------------------------
+    def StartSetpointStream( self, times: np.ndarray, voltages: np.ndarray=None, currents: np.ndarray=None, spinTime: float=0.002 ) -> bool:
+        #points are send at times [s] from start (monotonic clock), every time is counted from start so delays do not add up
+        #voltages/currents - arrays with the same length as times, None - not changed
+        #when sending is late and next point is already due, current point is skipped
+        #spinTime - last part of waiting is done in busy loop for better accuracy (sleep resolution of system)
+        if( self.IsSetpointStreaming() ): return False
+        times = np.asarray( times, dtype=np.float64 )
+        if( len(times) == 0 or ( voltages is None and currents is None ) ): return False
+
+        #all commands formatted before start
+        commands = [ "" ] * len(times)
+        if( voltages is not None ):
+            commands = [ command + "SOUR:VOLT " + "{:.4f}".format( voltage ) + self.__device.lineEnding          #SOURce:VOLTage
+                            for command, voltage in zip( commands, voltages ) ]
+        if( currents is not None ):
+            commands = [ command + "SOUR:CURR " + "{:.4f}".format( current ) + self.__device.lineEnding          #SOURce:CURRent
+                            for command, current in zip( commands, currents ) ]
+        commands = [ command.encode( "UTF-8" ) for command in commands ]
+
+        self.__streamStatistics = self.SetpointStreamStatistics( len(times) )
+        self.__streamStop.clear()
+        self.__streamThread = threading.Thread( target=self.__SetpointStreamLoop, args=(times - times[0], commands, spinTime), daemon=True )
+        self.__streamThread.start()
         return True
 
-        
\ No newline at end of file
+    #--------------------------------------------
+    def __SetpointStreamLoop( self, times: np.ndarray, commands: list, spinTime: float ):
+        stats = self.__streamStatistics
+        connIdx = 0
+        startTime = time.perf_counter()
+        for i in range( len(times) ):
+            #skip point when next one is already due
+            if( i+1 < len(times)
+                and time.perf_counter() >= startTime + times[i+1] ):
+                stats.pointsSkipped += 1
+                continue
+
+            scheduled = startTime + times[i]
+            remaining = scheduled - time.perf_counter() - spinTime
+            if( remaining > 0
+                and self.__streamStop.wait( remaining ) ):
+                break
+            while( time.perf_counter() < scheduled ):
+                pass
+            if( self.__streamStop.is_set() ): break
+
+            #connection is only reserved for time of sending, other commands can be send between points
+            connIdx = self.__device.Connect( connIdx )
+            if( connIdx == -1 ):
+                connIdx = 0
+                stats.sendErrors += 1
+                continue
+            stats.timingErrors[i] = time.perf_counter() - scheduled
+            if( self.__device.SendRaw( commands[i], connIdx=connIdx ) == connIdx ):
+                stats.pointsSent += 1
+                self.__device.Free( connIdx )
+            else:
+                stats.sendErrors += 1
+                connIdx = 0
+
+        if( connIdx != 0 ):
+            self.__device.Close( connIdx )
+
+    #--------------------------------------------
+    def StopSetpointStream( self ) -> bool:
+        if( self.__streamThread == None ): return False
+        self.__streamStop.set()
+        self.__streamThread.join()
+        self.__streamThread = None
+        return True
+
+    #--------------------------------------------
+    def WaitForSetpointStream( self, timeout: float=None ) -> bool:
+        #True when all points are finished
+        if( self.__streamThread == None ): return True
+        self.__streamThread.join( timeout )
+        return not self.__streamThread.is_alive()
+
+    #--------------------------------------------
+    def IsSetpointStreaming( self ) -> bool:
+        return ( self.__streamThread != None
+                and self.__streamThread.is_alive() )
+
+    #--------------------------------------------
+    def GetSetpointStreamStatistics( self ) -> SetpointStreamStatistics:
+        return self.__streamStatistics
+
+    #----------------------------------------------------------------------------------------------
+    # Telemetry sampler
+    #----------------------------------------------------------------------------------------------
+    TELEMETRY_COLUMNS = [ 'voltage', 'current', 'power', 'energy', 'output', 'inputs' ]
+
+    def StartTelemetrySampler( self, period: float=1.0, capacity: int=10000 ) -> TimeSeriesBuffer:
+        #telemetry read every period [s] to history with TELEMETRY_COLUMNS, time is from time.time()
+        #power = voltage * current [W], energy [J] is integrated (trapezoids, monotonic clock) from start of sampler
+        #connection is kept between samples but released, so other functions can be used at the same time
+        if( self.__sampler != None
+            and self.__sampler.IsRunning() ):
+            return None
+
+        self.__samplerConnIdx = 0
+        self.__samplerHistory = TimeSeriesBuffer( capacity, self.TELEMETRY_COLUMNS )
+        self.__samplerLast = None
+        self.__samplerEnergy = 0.0
+        self.__sampler = PeriodicWorker( period, self.__SampleTelemetry )
+        self.__sampler.Start()
+        return self.__samplerHistory
+
+    #--------------------------------------------
+    def __SampleTelemetry( self, tickTime: float ):
+        timestamp = time.time()                         #only for history, steps of system time would corrupt energy
+        sampleTime = time.monotonic()
+        connIdx = self.__device.Connect( self.__samplerConnIdx )
+        if( connIdx == -1 ):
+            voltage, current, output, inputs = [ float( 'nan' ), float( 'nan' ), False, -2147483648 ]
+        else:
+            self.__samplerConnIdx = connIdx
+            voltage, current, output, inputs = self.__GetTelemetry( connIdx )
+            self.__device.Free( connIdx )
+
+        #samples without measurement do not break integration, next sample is integrated from last correct one
+        power = voltage * current
+        if( not np.isnan( power ) ):
+            if( self.__samplerLast != None ):
+                lastTime, lastPower = self.__samplerLast
+                self.__samplerEnergy += ( power + lastPower ) / 2 * ( sampleTime - lastTime )
+            self.__samplerLast = ( sampleTime, power )
+        self.__samplerHistory.AppendSample( timestamp, ( voltage, current, power, self.__samplerEnergy, float( output ), float( inputs ) ) )
+
+    #--------------------------------------------
+    def StopTelemetrySampler( self ) -> bool:
+        if( self.__sampler == None ): return False
+        self.__sampler.Stop()
+        if( self.__samplerConnIdx != 0 ):
+            self.__device.Close( self.__samplerConnIdx )
+            self.__samplerConnIdx = 0
+        return True
+
+    #--------------------------------------------
+    def GetTelemetryHistory( self ) -> TimeSeriesBuffer:
+        return self.__samplerHistory
+
+    #--------------------------------------------
+    def GetEnergy( self ) -> float:
+        #[J] energy from start of telemetry sampler
+        return self.__samplerEnergy
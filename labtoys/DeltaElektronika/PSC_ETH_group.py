@@ -0,0 +1,113 @@
+#PSC_ETH_group.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Group of Delta Elektronika PSC-ETH power supplies - parallel settings and synchronized output switching
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#           - hardware synchronization with digital inputs/outputs of supplies
+#
+#       Usefull information and links:
+#           concurrent.futures  https://docs.python.org/3/library/concurrent.futures.html
+#
+
+from .PSC_ETH import PSC_ETH
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+class PSC_ETH_Group:
+
+    def __init__( self, units: list ):
+        self.__units = list( units )
+        self.__executor = ThreadPoolExecutor( max_workers=max( 1, len(self.__units) ) )
+        self.__switchOffsets = []
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def units( self ) -> list:
+        return self.__units
+
+    #---------------------------------------------------------------------
+    @property
+    def switchOffsets( self ) -> list:
+        #time [s] of sending output command to every unit relative to the first one in last EnableOutput/DisableOutput
+        return self.__switchOffsets
+
+    @property
+    def switchSkew( self ) -> float:
+        if( len(self.__switchOffsets) == 0 ): return float( 'nan' )
+        return max( self.__switchOffsets ) - min( self.__switchOffsets )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __RunParallel( self, function, args: list ) -> list:
+        #function( unit, arg ) for all units at the same time, results in order of units
+        futures = [ self.__executor.submit( function, unit, arg ) for unit, arg in zip( self.__units, args ) ]
+        return [ future.result() for future in futures ]
+
+    #--------------------------------------------
+    def __PerUnit( self, values ) -> list:
+        #one value for all units or list with value per unit
+        if( isinstance( values, (list, tuple) ) ):
+            return list( values )
+        return [ values ] * len(self.__units)
+
+    #----------------------------------------------------------------------------------------------
+    def GetIDN( self ) -> list:
+        return self.__RunParallel( lambda unit, arg: unit.GetIDN(), [None]*len(self.__units) )
+
+    #----------------------------------------------------------------------------------------------
+    def SetOutputVoltage( self, voltages ) -> bool:
+        #voltages - one value for all units or list with value per unit
+        return all( self.__RunParallel( lambda unit, voltage: unit.SetOutputVoltage( voltage ), self.__PerUnit( voltages ) ) )
+
+    #--------------------------------------------
+    def SetOutputCurrent( self, currents ) -> bool:
+        return all( self.__RunParallel( lambda unit, current: unit.SetOutputCurrent( current ), self.__PerUnit( currents ) ) )
+
+    #--------------------------------------------
+    def SetSetpoints( self, voltages, currents ) -> bool:
+        #voltage and current of one unit are set one after other, units in parallel
+        def Set( unit: PSC_ETH, setpoint: tuple ) -> bool:
+            voltage, current = setpoint
+            return unit.SetOutputVoltage( voltage ) & unit.SetOutputCurrent( current )
+        return all( self.__RunParallel( Set, list( zip( self.__PerUnit( voltages ), self.__PerUnit( currents ) ) ) ) )
+
+    #----------------------------------------------------------------------------------------------
+    def GetTelemetry( self ) -> list:
+        #list of PSC_ETH.GetTelemetry results in order of units
+        return self.__RunParallel( lambda unit, arg: unit.GetTelemetry(), [None]*len(self.__units) )
+
+    #----------------------------------------------------------------------------------------------
+    def __SwitchOutput( self, enable: bool ) -> bool:
+        #connections are opened in parallel before, then commands are released for all units at the same moment
+        if( not all( self.__RunParallel( lambda unit, arg: unit.PrepareOutputSwitch(), [None]*len(self.__units) ) ) ):
+            self.__RunParallel( lambda unit, arg: unit.CancelOutputSwitch(), [None]*len(self.__units) )
+            return False
+
+        barrier = threading.Barrier( len(self.__units) )
+        def Switch( unit: PSC_ETH, arg ) -> tuple:
+            barrier.wait()
+            sendTime = time.perf_counter()
+            return ( unit.SwitchPreparedOutput( enable ), sendTime )
+
+        results = self.__RunParallel( Switch, [None]*len(self.__units) )
+        sendTimes = [ sendTime for status, sendTime in results ]
+        self.__switchOffsets = [ sendTime - min( sendTimes ) for sendTime in sendTimes ]
+        return all( status for status, sendTime in results )
+
+    #--------------------------------------------
+    def EnableOutput( self ) -> bool:
+        return self.__SwitchOutput( True )
+
+    #--------------------------------------------
+    def DisableOutput( self ) -> bool:
+        return self.__SwitchOutput( False )
@@ -0,0 +1,115 @@
+#PSC_sequence.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Compiler of voltage/current profiles to Delta Elektronika sequencer steps (set value and wait)
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial version: sampling of linear and sine profiles, fitting of steps within tolerance
+#       -2026.10.19     version: 0.1.1
+#           - Levels shorter than minWait are fitted together with next samples, failure when tolerance can't be kept
+#           - Limit of steps counts END step, the limit is taken from PSC_ETH
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#           - use ramp steps when firmware supports them, now output of sequencer is a staircase
+#
+#       Usefull information and links:
+#           Programing manual:  https://www.delta-elektronika.nl/upload/MANUAL_ETHERNET_CARD_AND_MODULE.pdf     (2020.11.10)
+#
+
+from .PSC_ETH import PSC_ETH
+import numpy as np
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class PROFILE_QUANTITY:
+    VOLTAGE     = 'VOLT'
+    CURRENT     = 'CURR'
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def SampleLinear( points: list, sampleTime: float ) -> tuple:
+    #points - list of (time [s], value) of piecewise linear profile, times have to grow
+    #returns (times, values) sampled every sampleTime, last point is always included
+    points = np.asarray( points, dtype=np.float64 )
+    if( len(points) == 0 ): return ( np.empty( 0 ), np.empty( 0 ) )
+    times = np.arange( points[0, 0], points[-1, 0], sampleTime )
+    times = np.append( times, points[-1, 0] )
+    return ( times, np.interp( times, points[:, 0], points[:, 1] ) )
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def SampleSine( amplitude: float, offset: float, frequency: float, duration: float, sampleTime: float, phase: float=0.0 ) -> tuple:
+    #offset + amplitude * sin( 2*pi*frequency*t + phase ) for t from 0 to duration, phase in radians
+    times = np.arange( 0.0, duration, sampleTime )
+    times = np.append( times, duration )
+    return ( times, offset + amplitude * np.sin( 2*np.pi*frequency*times + phase ) )
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def FitSteps( values: np.ndarray, tolerance: float, times: np.ndarray=None, minDuration: float=0.0 ) -> list:
+    #the lowest number of constant levels which keep all samples within +-tolerance (greedy is optimal without minDuration)
+    #times and minDuration - every level except the last one lasts at least minDuration, so it covers more samples
+    #returns list of (index of first sample, level), empty list when level of minDuration can't keep tolerance
+    values = np.asarray( values, dtype=np.float64 )
+    steps = []
+    start = 0
+    while( start < len(values) ):
+        #window grows until range of values is too big, then exact end is found with running min/max
+        window = 64
+        while( True ):
+            part = values[start:start+window]
+            spread = np.maximum.accumulate( part ) - np.minimum.accumulate( part )
+            over = np.nonzero( spread > 2*tolerance )[0]
+            if( len(over) > 0
+                or start + window >= len(values) ):
+                break
+            window *= 2
+
+        length = over[0] if len(over) > 0 else len( part )
+        if( times is not None
+            and start + length < len(values) ):
+            #next level starts on first sample of its time (samples with the same time can't be split)
+            #level shorter than minDuration is fitted again with following samples
+            stop = max( np.searchsorted( times, times[start+length], side='left' ),
+                        np.searchsorted( times, times[start] + minDuration - 1e-9, side='left' ) )
+            if( stop <= start ):
+                stop = np.searchsorted( times, times[start], side='right' )
+            length = stop - start
+        segment = values[start:start+length]
+        if( segment.max() - segment.min() > 2*tolerance ): return []
+        steps.append( ( start, ( segment.max() + segment.min() ) / 2 ) )
+        start += length
+    return steps
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def CompileSequence( times: np.ndarray, values: np.ndarray, tolerance: float, quantity: PROFILE_QUANTITY=PROFILE_QUANTITY.VOLTAGE,
+                        endTime: float=None, minWait: float=0.001, maxSteps: int=PSC_ETH.SEQUENCE_MAX_STEPS ) -> list:
+    #sequence steps (for PSC_ETH.SendSequence) reproducing sampled profile as staircase within +-tolerance
+    #every sample holds its value until next sample, last one until endTime (None - end on last sample)
+    #times are rounded to 1 ms (resolution of WAIT), every level except the last one lasts at least minWait [s]
+    #empty list when tolerance can't be kept with minWait or sequence with END step is longer than maxSteps
+    times = np.asarray( times, dtype=np.float64 )
+    values = np.asarray( values, dtype=np.float64 )
+    if( len(times) == 0 ): return []
+    if( endTime == None ):
+        endTime = times[-1]
+
+    #waits from rounded absolute times, so rounding errors do not add up
+    #levels are send with 4 decimal places, rounding of level is taken from tolerance
+    times = np.round( times, 3 )
+    levels = FitSteps( values, tolerance - 0.00005, times, minWait )
+    if( len(levels) == 0 ): return []
+
+    steps = []
+    levelStart = times[0]
+    for i, ( start, level ) in enumerate( levels ):
+        stop = times[ levels[i+1][0] ] if i+1 < len(levels) else round( endTime, 3 )
+        wait = round( stop - levelStart, 3 )
+        steps.append( "SOUR:" + quantity + " " + "{:.4f}".format( level ) )                      #SOURce:VOLTage|CURRent
+        if( wait >= minWait ):
+            steps.append( "WAIT " + "{:.3f}".format( wait ) )
+        levelStart = stop
+    if( len(steps) + 1 > maxSteps ): return []                                                     #END step
+    return steps
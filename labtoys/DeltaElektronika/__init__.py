@@ -1,3 +1,5 @@
 #__init__.py
 
-from .PSC_ETH import PSC_ETH
\ No newline at end of file
+from .PSC_ETH import PSC_ETH
+from . import PSC_sequence
+from .PSC_ETH_group import PSC_ETH_Group
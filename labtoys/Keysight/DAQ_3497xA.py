@@ -10,6 +10,28 @@
 #   Changelog:
 #      	-2021.11.18		version: 0.1.0
 #      		- Initial class
+#       -2026.10.19     version: 0.2.0
+#           - ConfigureChannels sends one command per group of channels with the same settings, compressed scan list
+#       -2026.10.19     version: 0.3.0
+#           - Shadow of applied configuration, ConfigureChannels sends only changed channels
+#       -2026.10.19     version: 0.4.0
+#           - Continuous scanning with background draining of reading memory (DATA:REMove?) to ring buffer
+#       -2026.10.19     version: 0.5.0
+#           - Readings with time stamp, channel and unit parsed to numpy structured array (ScanResult)
+#       -2026.10.19     version: 0.6.0
+#           - Scaling of continuous scan blocks (SCAN_SCALING) or Mx+B scaling in device (CALCulate:SCALe)
+#       -2026.10.19     version: 0.7.0
+#           - Integration time (NPLC), auto zero and channel delay send together with configuration of channels group
+#       -2026.10.19     version: 0.7.1
+#           - Continuous scan can be prepared and started in two steps (for synchronized start of many devices)
+#       -2026.10.19     version: 0.8.0
+#           - Limits checking of continuous scan blocks (SCAN_LIMITS) and alarm limits in device (CALCulate:LIMit)
+#       -2026.10.19     version: 0.8.1
+#           - StopContinuousScan restores immediate trigger with count 1, so Read works after continuous scan
+#       -2026.10.19     version: 0.8.2
+#           - drainPeriod limited to scan interval when limits are checked
+#       -2026.10.19     version: 0.8.3
+#           - Fix connection of continuous scan left open when trigger settings can't be send in PrepareContinuousScan
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:
@@ -22,7 +44,12 @@
 # 
 
 from ..scpi import SCPI_Socket
+from ..buffers import TimeSeriesBuffer
+from ..periodic import PeriodicWorker
 from . import DAQ_channel_config as CFG
+import numpy as np
+import threading
+import time
 
 class DAQ_3497xA:
 
@@ -31,6 +58,28 @@ class DAQ_3497xA:
         self.__device.timeout = 15
         self.__device.sendDalay = 0.005
 
+        #shadow of configuration in device: channel number -> ConfigKey, scan list as channel numbers
+        self.__appliedConfig = {}
+        self.__appliedScanList = None
+        self.__appliedChannels = {}                     #channel number -> CHANNEL_CONFIG
+
+        #fields added to readings by FORMat:READing
+        self.__formatTime = False
+        self.__formatChannel = False
+        self.__formatUnit = False
+
+        #continuous scan
+        self.__scanWorker = None
+        self.__scanConnIdx = 0
+        self.__scanBuffer = None
+        self.__scanInterval = 1.0
+        self.__scanStartTime = 0.0
+        self.__scanCount = 0
+        self.__scanPending = np.empty( 0, dtype=self.READING_DTYPE )
+        self.__scanScaling = None
+        self.__scanLimits = None
+        self.__scanLock = threading.Lock()
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     # General Instructions
     #------------------------------------------------------------------------------------------------------------------------------------------------
@@ -53,8 +102,19 @@ class DAQ_3497xA:
 
     #----------------------------------------------------------------------------------------------
     def DeviceReset( self ) -> bool:
+        self.InvalidateChannelsConfig()
+        self.__formatTime = False
+        self.__formatChannel = False
+        self.__formatUnit = False
         return self.__device.SendCommand( "*RST" ) == 0
 
+    #----------------------------------------------------------------------------------------------
+    def InvalidateChannelsConfig( self ):
+        #forget applied configuration, next ConfigureChannels sends all channels
+        self.__appliedConfig = {}
+        self.__appliedScanList = None
+        self.__appliedChannels = {}
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     # Channel Configurator
     #------------------------------------------------------------------------------------------------------------------------------------------------
@@ -70,9 +130,7 @@ class DAQ_3497xA:
     #----------------------------------------------------------------------------------------------
     def __ConfigVoltageDC( self, channel: CFG.CHANNEL_CONFIG, connIdx=0 ) -> bool:
         if( channel.channelType == CFG.CHANNEL_TYPE.VOLT_DC ):
-            command = "CONF:VOLT:DC "
-            command += f"{channel.voltRange},{channel.ChannelString(True)}"
-            return self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+            return self.__ConfigureGroup( [channel], connIdx )
         else:
             return False
 
@@ -89,9 +147,7 @@ class DAQ_3497xA:
     #----------------------------------------------------------------------------------------------
     def __ConfigVoltageAC( self, channel: CFG.CHANNEL_CONFIG, connIdx=0 ) -> bool:
         if( channel.channelType == CFG.CHANNEL_TYPE.VOLT_AC ):
-            command = "CONF:VOLT:AC "
-            command += f"{channel.voltRange},{channel.ChannelString(True)}"
-            return self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+            return self.__ConfigureGroup( [channel], connIdx )
         else:
             return False
 
@@ -108,26 +164,70 @@ class DAQ_3497xA:
     #----------------------------------------------------------------------------------------------
     def __ConfigTempThermocuple( self, channel: CFG.CHANNEL_CONFIG, connIdx=0 ) -> bool:
         if( channel.channelType == CFG.CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
-            command = "CONF:TEMP TC,"
-            command += f"{channel.thermocoupleType},{channel.ChannelString(True)}"
-            return self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+            return self.__ConfigureGroup( [channel], connIdx )
         else:
             return False
 
     #------------------------------------------------------------------------------------------------------------------------------------------------
-    def __SendScanList( self, channels: list, connIdx=0 ) -> bool:
-        command = "ROUT:SCAN (@"
-        count = 0
+    def __ConfigCommand( self, channel: CFG.CHANNEL_CONFIG ) -> str:
+        #CONFigure command without channel list
+        if( channel.channelType == CFG.CHANNEL_TYPE.VOLT_DC ):
+            return f"CONF:VOLT:DC {channel.voltRange},"
+        elif( channel.channelType == CFG.CHANNEL_TYPE.VOLT_AC ):
+            return f"CONF:VOLT:AC {channel.voltRange},"
+        elif( channel.channelType == CFG.CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
+            return f"CONF:TEMP TC,{channel.thermocoupleType},"
+        return ""
+
+    #--------------------------------------------
+    def __SpeedCommand( self, channel: CFG.CHANNEL_CONFIG, channelList: str ) -> str:
+        #speed settings after CONFigure, empty when all are default
+        command = ""
+        function = ""
+        if( channel.channelType == CFG.CHANNEL_TYPE.VOLT_DC ):
+            function = "VOLT:DC"
+        elif( channel.channelType == CFG.CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
+            function = "TEMP"
+
+        if( channel.nplc != None
+            and len(function) > 0 ):
+            command += f";:SENS:{function}:NPLC {channel.nplc},{channelList}"                       #[SENSe:]<function>:NPLC
+        if( channel.autoZero != None
+            and len(function) > 0 ):
+            command += f";:SENS:ZERO:AUTO {channel.autoZero},{channelList}"                         #[SENSe:]ZERO:AUTO
+        if( channel.channelDelay != None ):
+            command += f";:ROUT:CHAN:DEL {channel.channelDelay},{channelList}"                      #ROUTe:CHANnel:DELay
+        return command
+
+    #----------------------------------------------------------------------------------------------
+    def __ConfigureGroup( self, channels: list, connIdx=0 ) -> bool:
+        #all channels have to have the same ConfigKey
+        command = self.__ConfigCommand( channels[0] )
+        if( len(command) == 0 ):
+            return False
+        channelList = CFG.ChannelListString( channels, True )
+        command += channelList
+        command += self.__SpeedCommand( channels[0], channelList )
+        if( self.__device.SendCommand( command, connIdx=connIdx ) != connIdx ):
+            return False
+
+        #CONFigure redefines scan list in device
         for ch in channels:
-            if( ch.scan ):
-                if( count != 0 ):
-                    command += ","
-                command += ch.ChannelString()
-                count += 1
-        command += ")"
-        if( count == 0 ):
+            self.__appliedConfig[ ch.ChannelNumber() ] = ch.ConfigKey()
+            self.__appliedChannels[ ch.ChannelNumber() ] = ch
+        self.__appliedScanList = None
+        return True
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __SendScanList( self, channels: list, connIdx=0 ) -> bool:
+        scanChannels = [ ch for ch in channels if ch.scan ]
+        if( len(scanChannels) == 0 ):
             return False
-        return self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+        command = "ROUT:SCAN " + CFG.ChannelListString( scanChannels, True )
+        if( self.__device.SendCommand( command, connIdx=connIdx ) != connIdx ):
+            return False
+        self.__appliedScanList = sorted( ch.ChannelNumber() for ch in scanChannels )
+        return True
 
     #----------------------------------------------------------------------------------------------
     def SendScanList( self, channels: list ) -> bool:
@@ -145,30 +245,344 @@ class DAQ_3497xA:
             return False
 
     #----------------------------------------------------------------------------------------------
-    def ConfigureChannels( self, channels: list ) -> bool:
+    def ConfigureChannels( self, channels: list, fullResync: bool=False ) -> bool:
+        #only channels with settings different than applied before are send, scan list only when changed
+        #fullResync - send all channels, e.g. when device was configured from front panel
+        if( fullResync ):
+            self.InvalidateChannelsConfig()
+
+        changed = [ ch for ch in channels if self.__appliedConfig.get( ch.ChannelNumber() ) != ch.ConfigKey() ]
+        scanList = sorted( ch.ChannelNumber() for ch in channels if ch.scan )
+        if( len(changed) == 0
+            and scanList == self.__appliedScanList ):
+            return True
+
         connIdx = self.__device.Connect()
         if( connIdx == -1 ):    return False
 
-        #configure channels
+        #configure channels, one command for channels with the same settings
         status = True
-        for i, ch, in enumerate( channels ):
-            status &= self.ConfigureChannel( ch, connIdx )
+        for group in CFG.GroupChannels( changed ):
+            status &= self.__ConfigureGroup( group, connIdx )
             if( status == False ): break
         
         #send scan list
-        if( status ):
+        if( status
+            and scanList != self.__appliedScanList ):
             status &= self.__SendScanList( channels, connIdx )
 
         self.__device.Close( connIdx )
         return status
 
     #----------------------------------------------------------------------------------------------
-    def Read( self ) -> list:
-        command = "READ?"
-        ans = self.__device.SendCommandGetAns( command )
-        if( len(ans) == 0 ): return []
+    def EstimateScanTime( self, lineFrequency: float=50.0 ) -> float:
+        #approximate time [s] of one sweep of applied scan list, see DAQ_channel_config.EstimateScanTime
+        channels = [ ch for ch in self.__ScanChannels() if ch != None ]
+        return CFG.EstimateScanTime( channels, lineFrequency )
+
+    #----------------------------------------------------------------------------------------------
+    def Read( self, structured: bool=False ):
+        #one scan, list of values or ScanResult when structured (time stamp, channel and unit are turned on in device)
+        if( structured
+            and not ( self.__formatTime and self.__formatChannel and self.__formatUnit ) ):
+            if( self.SetReadingFormat( True, True, True ) == False ): return None
+
+        ans = self.__device.SendCommandGetLine( "READ?" )
+        readings = self.__ParseReadings( ans )
+        if( not structured ):
+            return readings['value'].tolist()
+        if( len(ans) == 0 ): return None
+        return self.ScanResult( readings, self.__ScanChannels() )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # Scaling in device
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def ApplyScalingInDevice( self, channels: list ) -> bool:
+        #Mx+B (gain, offset) and temperature unit of channels are set in device, readings comes already scaled
+        #has to be called after ConfigureChannels, CONFigure resets scaling of channel
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+
+        #channels with the same settings in one command
+        scaled = {}
+        units = {}
+        for ch in channels:
+            scaled.setdefault( (ch.gain, ch.offset), [] ).append( ch )
+            if( ch.channelType == CFG.CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
+                units.setdefault( ch.tempUnit, [] ).append( ch )
+
+        status = True
+        for unit, group in units.items():
+            command = f"UNIT:TEMP {unit},{CFG.ChannelListString( group, True )}"                    #UNIT:TEMPerature
+            status &= self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+        for (gain, offset), group in scaled.items():
+            channelList = CFG.ChannelListString( group, True )
+            if( gain == 1.0 and offset == 0.0 ):
+                command = f"CALC:SCAL:STAT OFF,{channelList}"                                       #CALCulate:SCALe:STATe
+            else:
+                command = f"CALC:SCAL:GAIN {gain},{channelList}"                                    #CALCulate:SCALe:GAIN
+                command += f";:CALC:SCAL:OFFS {offset},{channelList}"                                #CALCulate:SCALe:OFFSet
+                command += f";:CALC:SCAL:STAT ON,{channelList}"
+            status &= self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+
+        self.__device.Close( connIdx )
+        return status
+
+    #----------------------------------------------------------------------------------------------
+    def ArmDeviceLimits( self, channels: list, alarmOutput: int=None ) -> bool:
+        #low and high limits of channels are set in device, crossing sets alarm output without waiting for host
+        #rate limit is not available in device, limits are compared with scaled values
+        #alarmOutput - 1 to 4, None - default output of card (slot 100 - 1, 200 - 2, 300 - 3)
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+
+        #channels with the same limits in one command
+        limited = {}
+        for ch in channels:
+            limited.setdefault( (ch.limitLow, ch.limitHigh), [] ).append( ch )
+
+        status = True
+        for (low, high), group in limited.items():
+            channelList = CFG.ChannelListString( group, True )
+            command = ""
+            for limit, name in ( (low, "LOW"), (high, "UPP") ):                                      #CALCulate:LIMit:LOWer|UPPer
+                if( limit == None ):
+                    command += f";:CALC:LIM:{name}:STAT OFF,{channelList}"
+                else:
+                    command += f";:CALC:LIM:{name} {limit},{channelList};:CALC:LIM:{name}:STAT ON,{channelList}"
+            status &= self.__device.SendCommand( command[2:], connIdx=connIdx ) == connIdx
+
+        if( alarmOutput != None ):
+            armed = [ ch for ch in channels if ch.limitLow != None or ch.limitHigh != None ]
+            if( len(armed) > 0 ):
+                command = f"OUTP:ALAR{alarmOutput}:SOUR {CFG.ChannelListString( armed, True )}"        #OUTPut:ALARm<n>:SOURce
+                status &= self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+
+        self.__device.Close( connIdx )
+        return status
+
+    #--------------------------------------------
+    def DisarmDeviceLimits( self, channels: list ) -> bool:
+        channelList = CFG.ChannelListString( channels, True )
+        command = f"CALC:LIM:LOW:STAT OFF,{channelList};:CALC:LIM:UPP:STAT OFF,{channelList}"
+        return self.__device.SendCommand( command ) == 0
+
+    #--------------------------------------------
+    def ClearDeviceAlarms( self ) -> bool:
+        return self.__device.SendCommand( "OUTP:ALAR:CLE:ALL" ) == 0                                 #OUTPut:ALARm:CLEar:ALL
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # Readings format
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def SetReadingFormat( self, time: bool=True, channel: bool=True, unit: bool=True ) -> bool:
+        #time is relative to start of scan
+        command = "FORM:READ:TIME " + ("ON" if time else "OFF")                                      #FORMat:READing:TIME
+        command += ";:FORM:READ:TIME:TYPE REL"                                                      #FORMat:READing:TIME:TYPE RELative
+        command += ";:FORM:READ:CHAN " + ("ON" if channel else "OFF")                                #FORMat:READing:CHANnel
+        command += ";:FORM:READ:UNIT " + ("ON" if unit else "OFF")                                   #FORMat:READing:UNIT
+        if( self.__device.SendCommand( command ) != 0 ): return False
+        self.__formatTime = time
+        self.__formatChannel = channel
+        self.__formatUnit = unit
+        return True
+
+    #----------------------------------------------------------------------------------------------
+    READING_DTYPE = np.dtype( [ ('time', np.float64), ('channel', np.int32), ('value', np.float64), ('unit', 'U4'), ('config', np.int32) ] )
+
+    #--------------------------------------------
+    def __ScanChannels( self ) -> list:
+        if( self.__appliedScanList == None ): return []
+        return [ self.__appliedChannels.get( number ) for number in self.__appliedScanList ]
+
+    #--------------------------------------------
+    def __ParseReadings( self, ans: str ) -> np.ndarray:
+        #all readings parsed at once, reading format: <value>[ <unit>][,<time>][,<channel>]
+        #time is nan and channel 0 when not send by device, config is index of channel in scan list (-1 unknown)
+        if( len(ans) == 0 ): return np.empty( 0, dtype=self.READING_DTYPE )
+        fieldsCount = 1 + int( self.__formatTime ) + int( self.__formatChannel )
+        fields = np.array( ans.split( ',' ) )
+        if( len(fields) % fieldsCount != 0 ): return np.empty( 0, dtype=self.READING_DTYPE )
+        fields = fields.reshape( -1, fieldsCount )
+
+        readings = np.zeros( len(fields), dtype=self.READING_DTYPE )
+        try:
+            if( self.__formatUnit ):
+                valueUnit = np.char.partition( fields[:, 0], ' ' )
+                readings['value'] = valueUnit[:, 0].astype( np.float64 )
+                readings['unit'] = valueUnit[:, 2]
+            else:
+                readings['value'] = fields[:, 0].astype( np.float64 )
+            readings['time'] = fields[:, 1].astype( np.float64 ) if self.__formatTime else np.nan
+            if( self.__formatChannel ):
+                readings['channel'] = fields[:, -1].astype( np.int32 )
+        except ValueError:
+            return np.empty( 0, dtype=self.READING_DTYPE )
+
+        #tag readings with position in scan list
+        readings['config'] = -1
+        if( self.__formatChannel
+            and self.__appliedScanList != None
+            and len(self.__appliedScanList) > 0 ):
+            scanList = np.array( self.__appliedScanList )
+            idx = np.minimum( np.searchsorted( scanList, readings['channel'] ), len(scanList)-1 )
+            readings['config'] = np.where( scanList[idx] == readings['channel'], idx, -1 )
+        return readings
+
+    #----------------------------------------------------------------------------------------------
+    class ScanResult:
+
+        def __init__( self, readings: np.ndarray, channels: list ):
+            self.__readings = readings
+            self.__channels = channels
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def readings( self ) -> np.ndarray:
+            #structured array with fields: time, channel, value, unit, config
+            return self.__readings
+
+        #-----------------------------------------------------------------
+        @property
+        def channels( self ) -> list:
+            #CHANNEL_CONFIG of scan list, field config of readings is index in this list
+            return self.__channels
+
+        #------------------------------------------------------------------------------------------
+        def Config( self, idx: int ) -> CFG.CHANNEL_CONFIG:
+            #configuration of channel for reading idx
+            configIdx = self.__readings['config'][idx]
+            if( configIdx < 0 ): return None
+            return self.__channels[configIdx]
+
+        #------------------------------------------------------------------------------------------
+        def ByChannel( self, channel ) -> np.ndarray:
+            #readings of one channel, channel - number (e.g. 101) or CHANNEL_CONFIG
+            if( isinstance( channel, CFG.CHANNEL_CONFIG ) ):
+                channel = channel.ChannelNumber()
+            return self.__readings[ self.__readings['channel'] == channel ]
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # Continuous scan
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def StartContinuousScan( self, interval: float=1.0, scanCount: int=None, capacity: int=10000, drainPeriod: float=0.5,
+                                scaling: CFG.SCAN_SCALING=None, limits: CFG.SCAN_LIMITS=None ) -> TimeSeriesBuffer:
+        #scans are triggered by device timer every interval [s], scanCount=None - until StopContinuousScan
+        #readings are taken from device memory every drainPeriod [s] and stored in buffer of capacity scans
+        #buffer columns are named ch<number> (e.g. ch101), time is start time (time.time()) + scan idx * interval
+        #channels have to be configured before with ConfigureChannels
+        #scaling - applied to every block of scans before it is stored, it has to be made for the same scan list
+        #limits - checked on every block of scans after scaling, drainPeriod is limited to interval,
+        #         so alarm callbacks come not later than one scan after violation
+        scans = self.PrepareContinuousScan( interval, scanCount, capacity, drainPeriod, scaling, limits )
+        if( scans == None ): return None
+        if( self.InitContinuousScan() == False ): return None
+        return scans
+
+    #--------------------------------------------
+    def PrepareContinuousScan( self, interval: float=1.0, scanCount: int=None, capacity: int=10000, drainPeriod: float=0.5,
+                                scaling: CFG.SCAN_SCALING=None, limits: CFG.SCAN_LIMITS=None ) -> TimeSeriesBuffer:
+        #first part of StartContinuousScan - trigger settings, buffer and open connection, scan starts with InitContinuousScan
+        if( self.IsContinuousScanRunning()
+            or self.__appliedScanList == None ):
+            return None
+
+        connIdx = self.__device.Connect( self.__scanConnIdx )
+        if( connIdx == -1 ): return None
+        self.__scanConnIdx = connIdx
+
+        count = "INF" if scanCount == None else str( scanCount )
+        command = f"TRIG:SOUR TIM;:TRIG:TIM {interval};:TRIG:COUN {count}"                          #TRIGger:SOURce TIMer;TIMer;COUNt
+        if( self.__device.SendCommand( command, connIdx=connIdx ) != connIdx ):
+            self.__device.Close( connIdx )
+            self.__scanConnIdx = 0
+            return None
+
+        self.__scanBuffer = TimeSeriesBuffer( capacity, [ "ch" + str(ch) for ch in self.__appliedScanList ] )
+        self.__scanInterval = interval
+        self.__scanCount = 0
+        self.__scanPending = np.empty( 0, dtype=self.READING_DTYPE )
+        self.__scanScaling = scaling
+        self.__scanLimits = limits
+        if( limits != None ):
+            limits.Reset()
+            drainPeriod = min( drainPeriod, interval )
+        self.__scanWorker = PeriodicWorker( drainPeriod, self.__DrainReadings )
+        return self.__scanBuffer
+
+    #--------------------------------------------
+    def InitContinuousScan( self ) -> bool:
+        #starts scan prepared with PrepareContinuousScan, only INIT is send on already opened connection
+        if( self.__scanWorker == None
+            or self.__scanWorker.IsRunning() ):
+            return False
+
+        self.__scanStartTime = time.time()
+        if( self.__device.SendCommand( "INIT", connIdx=self.__scanConnIdx ) != self.__scanConnIdx ): return False  #INITiate
+        self.__device.Free( self.__scanConnIdx )
+        self.__scanWorker.Start()
+        return True
+
+    #--------------------------------------------
+    def __DrainReadings( self, tickTime: float=0.0 ):
+        with self.__scanLock:
+            connIdx = self.__device.Connect( self.__scanConnIdx )
+            if( connIdx == -1 ): return
+            self.__scanConnIdx = connIdx
+
+            readings = np.empty( 0, dtype=self.READING_DTYPE )
+            ans = self.__device.SendCommandGetAns( "DATA:POIN?", connIdx=connIdx )                  #DATA:POINts?
+            try:
+                points = int( ans )
+            except ValueError:
+                points = 0
+            if( points > 0 ):
+                ans = self.__device.SendCommandGetLine( f"DATA:REM? {points}", connIdx=connIdx )    #DATA:REMove? <count>
+                readings = self.__ParseReadings( ans )
+            self.__device.Free( connIdx )
+            self.__StoreReadings( readings )
+
+    #--------------------------------------------
+    def __StoreReadings( self, readings: np.ndarray ):
+        #only complete scans goes to buffer, rest waits for next readings
+        readings = np.concatenate( (self.__scanPending, readings) )
+        channels = len( self.__scanBuffer.columns )
+        scans = len( readings ) // channels
+        self.__scanPending = readings[scans*channels:]
+        if( scans == 0 ): return
+
+        #time of scan from device time stamp of first reading if it is available
+        if( self.__formatTime ):
+            times = self.__scanStartTime + readings['time'][:scans*channels:channels]
+        else:
+            times = self.__scanStartTime + ( self.__scanCount + np.arange( scans ) ) * self.__scanInterval
+        self.__scanCount += scans
+        values = readings['value'][:scans*channels].reshape( scans, channels )
+        if( self.__scanScaling != None ):
+            values = self.__scanScaling.Apply( values )
+        self.__scanBuffer.ExtendSamples( times, values )
+        if( self.__scanLimits != None ):
+            self.__scanLimits.Check( times, values )
+
+    #----------------------------------------------------------------------------------------------
+    def StopContinuousScan( self ) -> bool:
+        #stops scanning and takes readings left in device memory
+        if( self.__scanWorker == None ): return False
+        self.__scanWorker.Stop()
+        self.__scanWorker = None
+        status = self.__device.SendCommand( "ABOR" ) == 0                                           #ABORt
+        self.__DrainReadings()
+        #back to single sweep on READ?
+        status &= self.__device.SendCommand( "TRIG:SOUR IMM;:TRIG:COUN 1" ) == 0                    #TRIGger:SOURce IMMediate;COUNt
+        if( self.__scanConnIdx != 0 ):
+            self.__device.Close( self.__scanConnIdx )
+            self.__scanConnIdx = 0
+        return status
+
+    #--------------------------------------------
+    def IsContinuousScanRunning( self ) -> bool:
+        return ( self.__scanWorker != None
+                and self.__scanWorker.IsRunning() )
 
-        result = ans.split( "," )
-        for i in range( len( result ) ):
-            result[i] = float( result[i] )
-        return result
+    #--------------------------------------------
+    def GetContinuousScanBuffer( self ) -> TimeSeriesBuffer:
+        return self.__scanBuffer
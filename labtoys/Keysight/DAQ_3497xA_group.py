@@ -0,0 +1,140 @@
+#DAQ_3497xA_group.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Group of Keysight 3497xA devices working together - parallel configuration and synchronized scanning
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class
+#       -2026.10.19     version: 0.1.1
+#           - Limits checking per unit in StartContinuousScan
+#       -2026.10.19     version: 0.1.2
+#           - Fix GetMergedScans mixing scan numbers when drain was running between copy of buffer and its written counter
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#           - hardware trigger (EXT) chain for better synchronization than with network commands
+#
+#       Usefull information and links:
+#           concurrent.futures  https://docs.python.org/3/library/concurrent.futures.html
+#
+
+from .DAQ_3497xA import DAQ_3497xA
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import numpy as np
+
+class DAQ_3497xA_Group:
+
+    def __init__( self, units: list ):
+        self.__units = list( units )
+        self.__executor = ThreadPoolExecutor( max_workers=max( 1, len(self.__units) ) )
+        self.__buffers = []
+        self.__startOffsets = []
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def units( self ) -> list:
+        return self.__units
+
+    #---------------------------------------------------------------------
+    @property
+    def startOffsets( self ) -> list:
+        #time [s] of INIT send to every unit relative to the first one in last StartContinuousScan
+        return self.__startOffsets
+
+    @property
+    def startSkew( self ) -> float:
+        if( len(self.__startOffsets) == 0 ): return float( 'nan' )
+        return max( self.__startOffsets ) - min( self.__startOffsets )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __RunParallel( self, function, args: list ) -> list:
+        #function( unit, arg ) for all units at the same time, results in order of units
+        futures = [ self.__executor.submit( function, unit, arg ) for unit, arg in zip( self.__units, args ) ]
+        return [ future.result() for future in futures ]
+
+    #----------------------------------------------------------------------------------------------
+    def ConfigureChannels( self, channelsPerUnit: list, fullResync: bool=False ) -> bool:
+        #channelsPerUnit - list of CHANNEL_CONFIG lists, one per unit
+        results = self.__RunParallel( lambda unit, channels: unit.ConfigureChannels( channels, fullResync ), channelsPerUnit )
+        return all( results )
+
+    #----------------------------------------------------------------------------------------------
+    def Read( self, structured: bool=False ) -> list:
+        #one scan of every unit, results in order of units
+        return self.__RunParallel( lambda unit, arg: unit.Read( structured ), [None]*len(self.__units) )
+
+    #----------------------------------------------------------------------------------------------
+    def EstimateScanTime( self, lineFrequency: float=50.0 ) -> float:
+        #units scan at the same time, the slowest one decides
+        return max( [ unit.EstimateScanTime( lineFrequency ) for unit in self.__units ], default=0.0 )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def StartContinuousScan( self, interval: float=1.0, scanCount: int=None, capacity: int=10000, drainPeriod: float=0.5,
+                                scalings: list=None, limits: list=None ) -> bool:
+        #all units are prepared in parallel, then INIT is released for all of them at the same moment
+        #scalings - SCAN_SCALING per unit or None, limits - SCAN_LIMITS per unit or None
+        if( scalings == None ):
+            scalings = [None] * len(self.__units)
+        if( limits == None ):
+            limits = [None] * len(self.__units)
+
+        self.__buffers = self.__RunParallel( lambda unit, args: unit.PrepareContinuousScan( interval, scanCount, capacity, drainPeriod, *args ),
+                                                list( zip( scalings, limits ) ) )
+        if( any( buffer == None for buffer in self.__buffers ) ):
+            self.StopContinuousScan()
+            return False
+
+        barrier = threading.Barrier( len(self.__units) )
+        def Init( unit: DAQ_3497xA, arg ) -> tuple:
+            barrier.wait()
+            sendTime = time.perf_counter()
+            return ( unit.InitContinuousScan(), sendTime )
+
+        results = self.__RunParallel( Init, [None]*len(self.__units) )
+        sendTimes = [ sendTime for status, sendTime in results ]
+        self.__startOffsets = [ sendTime - min( sendTimes ) for sendTime in sendTimes ]
+        if( not all( status for status, sendTime in results ) ):
+            self.StopContinuousScan()
+            return False
+        return True
+
+    #----------------------------------------------------------------------------------------------
+    def StopContinuousScan( self ) -> bool:
+        results = self.__RunParallel( lambda unit, arg: unit.StopContinuousScan(), [None]*len(self.__units) )
+        return all( results )
+
+    #----------------------------------------------------------------------------------------------
+    def GetMergedScans( self, length: int=None ) -> np.ndarray:
+        #one table of scans from all units: field 'time' (mean of units scan time) and u<unit idx>_ch<number> columns
+        #rows are joined by scan number - units are triggered by timers with the same interval started together
+        #only scans available in all units are returned, last length of them (all when None)
+        if( len(self.__buffers) == 0 ): return None
+
+        #samples and written counter from one snapshot, drain threads keep appending
+        snapshots = [ buffer.GetSnapshot() for buffer in self.__buffers ]
+        firstScan = max( written - len(sample) for sample, written in snapshots )
+        lastScan = min( written for sample, written in snapshots )
+        if( length != None ):
+            firstScan = max( firstScan, lastScan - length )
+        count = max( 0, lastScan - firstScan )
+
+        columns = [ ('time', np.float64) ]
+        for i, buffer in enumerate( self.__buffers ):
+            columns += [ ( "u" + str(i) + "_" + name, np.float64 ) for name in buffer.columns ]
+        merged = np.zeros( count, dtype=columns )
+        times = np.zeros( count )
+        for i, (buffer, (sample, written)) in enumerate( zip( self.__buffers, snapshots ) ):
+            first = firstScan - ( written - len(sample) )
+            part = sample[first:first+count]
+            times += part['time']
+            for name in buffer.columns:
+                merged[ "u" + str(i) + "_" + name ] = part[name]
+        merged['time'] = times / len(self.__buffers)
+        return merged
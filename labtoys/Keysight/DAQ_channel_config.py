@@ -10,8 +10,20 @@
 #   Changelog:
 #      	-2021.12.13		version: 0.1.0
 #      		- Initial class
+#       -2026.10.19     version: 0.2.0
+#           - Grouping of channels with the same settings and compressed channel lists (@101:120,201:220)
+#       -2026.10.19     version: 0.3.0
+#           - SCAN_SCALING - Mx+B scaling and temperature unit conversion of whole blocks of readings
+#       -2026.10.19     version: 0.4.0
+#           - Integration time, auto zero and channel delay settings, speed profiles and scan time estimation
+#       -2026.10.19     version: 0.5.0
+#           - Alarm limits of channels (low, high, rate of change) and SCAN_LIMITS - checking of whole blocks of scans
+#       -2026.10.19     version: 0.5.1
+#           - Exceptions of SCAN_LIMITS callbacks are caught and counted, so they do not stop scan draining
 #
 
+import numpy as np
+
 class CHANNEL_TYPE:
     VOLT_DC             = 0
     VOLT_AC             = 1
@@ -49,6 +61,34 @@ class RESOLUTION:
     RES_5_HALF_DIGIT    = 10000
     RES_6_HALF_DIGIT    = 100000
 
+#integration time in power line cycles giving resolution
+RESOLUTION_NPLC = { RESOLUTION.RES_4_HALF_DIGIT:    0.02,
+                    RESOLUTION.RES_5_HALF_DIGIT:    1,
+                    RESOLUTION.RES_6_HALF_DIGIT:    10 }
+
+#--------------------------------------------------------------------------------------------------
+class AUTO_ZERO:
+    OFF     = 'OFF'
+    ONCE    = 'ONCE'
+    ON      = 'ON'
+
+#--------------------------------------------------------------------------------------------------
+class SPEED_PROFILE:
+    FAST        = 0                 #4.5 digit, no auto zero, no channel delay
+    BALANCED    = 1                 #5.5 digit, auto zero once, automatic channel delay
+    PRECISE     = 2                 #6.5 digit, auto zero every reading, automatic channel delay
+
+#resolution, auto zero, channel delay (None - automatic) of profile
+PROFILE_SETTINGS = { SPEED_PROFILE.FAST:        ( RESOLUTION.RES_4_HALF_DIGIT, AUTO_ZERO.OFF,  0.0 ),
+                     SPEED_PROFILE.BALANCED:    ( RESOLUTION.RES_5_HALF_DIGIT, AUTO_ZERO.ONCE, None ),
+                     SPEED_PROFILE.PRECISE:     ( RESOLUTION.RES_6_HALF_DIGIT, AUTO_ZERO.ON,   None ) }
+
+#--------------------------------------------------------------------------------------------------
+class LIMIT_TYPE:
+    LOW     = 'LOW'
+    HIGH    = 'HIGH'
+    RATE    = 'RATE'
+
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 class CHANNEL_CONFIG:
 
@@ -70,10 +110,41 @@ class CHANNEL_CONFIG:
         self.offset = 0.0
         #self.unit = #TO DO
 
+        #speed and accuracy, None - device default after CONFigure (1 NPLC, auto zero ON, automatic delay)
+        self.nplc = None
+        self.autoZero = None
+        self.channelDelay = None                        #[s]
+
+        #alarm limits, None - not checked, values after Mx+B scaling
+        self.limitLow = None
+        self.limitHigh = None
+        self.limitRate = None                           #[unit/s], absolute value of change between scans, only host side
+
     #----------------------------------------------------------------------------------------------
     def ChannelString( self, withAt=False ) -> str:
         return ChannelString( self.card, self.channel, withAt )
 
+    #----------------------------------------------------------------------------------------------
+    def ChannelNumber( self ) -> int:
+        return self.card * 100 + self.channel
+
+    #----------------------------------------------------------------------------------------------
+    def ConfigKey( self ) -> tuple:
+        #settings send during configuration, channels with the same key can be configured with one command
+        speed = ( self.nplc, self.autoZero, self.channelDelay )
+        if( self.channelType == CHANNEL_TYPE.TEMP_THERMOCOUPLE ):
+            return ( self.channelType, self.thermocoupleType ) + speed
+        return ( self.channelType, self.voltRange ) + speed
+
+    #----------------------------------------------------------------------------------------------
+    def SetResolution( self, resolution: RESOLUTION ):
+        self.nplc = RESOLUTION_NPLC[ resolution ]
+
+    #----------------------------------------------------------------------------------------------
+    def SetSpeedProfile( self, profile: SPEED_PROFILE ):
+        resolution, self.autoZero, self.channelDelay = PROFILE_SETTINGS[ profile ]
+        self.SetResolution( resolution )
+
     #----------------------------------------------------------------------------------------------
     def Scaling( self, value: float ) -> float:
         return value * self.gain + self.offset
@@ -83,4 +154,252 @@ def ChannelString( card, channel, withAt=False ) -> str:
     res = '{:01}'.format( card ) + '{:02}'.format( channel )
     if( withAt ):
         res = "(@" + res + ")"
-    return res
\ No newline at end of file
+    return res
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def SetSpeedProfile( channels: list, profile: SPEED_PROFILE ):
+    for ch in channels:
+        ch.SetSpeedProfile( profile )
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def EstimateScanTime( channels: list, lineFrequency: float=50.0, switchTime: float=0.01 ) -> float:
+    #approximate time [s] of one sweep of scan list
+    #switchTime - relay switching and measurement overhead per channel, ~0.01 s for 34901A armature multiplexer
+    #values of automatic channel delay and AC measurement are from user guide for default settings
+    total = 0.0
+    for ch in channels:
+        if( not ch.scan ): continue
+        if( ch.channelType == CHANNEL_TYPE.VOLT_AC ):
+            integration = 0.1
+            delay = 1.0 if ch.channelDelay == None else ch.channelDelay             #20 Hz (medium) AC filter
+        else:
+            nplc = 1 if ch.nplc == None else ch.nplc
+            integration = nplc / lineFrequency
+            if( ch.autoZero == None
+                or ch.autoZero == AUTO_ZERO.ON ):
+                integration *= 2                                                    #zero is measured after every reading
+            if( ch.channelDelay != None ):
+                delay = ch.channelDelay
+            else:
+                delay = 0.002 if nplc >= 1 else 0.001
+        total += switchTime + delay + integration
+    return total
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def ChannelListString( channels: list, withAt=False ) -> str:
+    #compressed list of channels, ranges of following channels on the same card are joined: 101:120,201:220
+    #channels - list of CHANNEL_CONFIG or channel numbers (card*100 + channel)
+    numbers = []
+    for ch in channels:
+        if( isinstance( ch, CHANNEL_CONFIG ) ):
+            numbers.append( ch.ChannelNumber() )
+        else:
+            numbers.append( int( ch ) )
+    numbers = sorted( set( numbers ) )
+
+    ranges = []
+    i = 0
+    while( i < len(numbers) ):
+        first = numbers[i]
+        while( i+1 < len(numbers)
+                and numbers[i+1] == numbers[i] + 1
+                and numbers[i+1] // 100 == first // 100 ):
+            i += 1
+        if( numbers[i] == first ):
+            ranges.append( '{:03}'.format( first ) )
+        else:
+            ranges.append( '{:03}'.format( first ) + ":" + '{:03}'.format( numbers[i] ) )
+        i += 1
+
+    res = ",".join( ranges )
+    if( withAt ):
+        res = "(@" + res + ")"
+    return res
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+def GroupChannels( channels: list ) -> list:
+    #list of groups (lists) of channels with the same ConfigKey, groups are in order of first channel
+    groups = {}
+    for ch in channels:
+        key = ch.ConfigKey()
+        if( not key in groups ):
+            groups[key] = []
+        groups[key].append( ch )
+    return list( groups.values() )
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class SCAN_SCALING:
+    #gain and offset vectors for channels in scan list (scan order - ascending channel number) built once
+    #temperature conversion from deviceUnit to tempUnit of channel is joined with Mx+B: (x*a + b)*gain + offset
+
+    #conversion from Celsius: value = C*a + b
+    __FROM_CELSIUS = { TEMP_UNIT.CELSIUS:       (1.0, 0.0),
+                       TEMP_UNIT.FAHRENHEIT:    (1.8, 32.0),
+                       TEMP_UNIT.KELVIN:        (1.0, 273.15) }
+
+    def __init__( self, channels: list, deviceUnit: str=TEMP_UNIT.CELSIUS ):
+        self.__channels = sorted( [ ch for ch in channels if ch.scan ], key=lambda ch: ch.ChannelNumber() )
+        self.__gain = np.ones( len(self.__channels) )
+        self.__offset = np.zeros( len(self.__channels) )
+
+        for i, ch in enumerate( self.__channels ):
+            a = 1.0
+            b = 0.0
+            if( ch.channelType == CHANNEL_TYPE.TEMP_THERMOCOUPLE
+                and ch.tempUnit != deviceUnit ):
+                #device unit -> Celsius -> channel unit
+                toA, toB = self.__FROM_CELSIUS[ ch.tempUnit ]
+                fromA, fromB = self.__FROM_CELSIUS[ deviceUnit ]
+                a = toA / fromA
+                b = toB - fromB * a
+            self.__gain[i] = a * ch.gain
+            self.__offset[i] = b * ch.gain + ch.offset
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def channels( self ) -> list:
+        return self.__channels
+
+    @property
+    def gain( self ) -> np.ndarray:
+        return self.__gain
+
+    @property
+    def offset( self ) -> np.ndarray:
+        return self.__offset
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def Apply( self, values: np.ndarray ) -> np.ndarray:
+        #values - 2D array (row per scan) or 1D array of following scans
+        values = np.asarray( values, dtype=np.float64 )
+        if( values.ndim == 1 ):
+            return ( values.reshape( -1, len(self.__gain) ) * self.__gain + self.__offset ).reshape( -1 )
+        return values * self.__gain + self.__offset
+
+    #----------------------------------------------------------------------------------------------
+    def ApplyReadings( self, readings: np.ndarray ) -> np.ndarray:
+        #copy of structured readings (DAQ_3497xA.READING_DTYPE) with scaled values, uses field config as channel index
+        res = readings.copy()
+        known = res['config'] >= 0
+        idx = res['config'][known]
+        res['value'][known] = res['value'][known] * self.__gain[idx] + self.__offset[idx]
+        return res
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class SCAN_LIMITS:
+    #limits vectors for channels in scan list (scan order - ascending channel number) built once
+    #Check takes block of scans, finds readings out of limits and calls callbacks with new alarms
+    #alarm is reported once when it starts, next report after values come back to limits
+
+    #alarm event: time of scan, channel number, LIMIT_TYPE, value (rate for LIMIT_TYPE.RATE), crossed limit
+    EVENT_DTYPE = np.dtype( [ ('time', np.float64), ('channel', np.int32), ('type', 'U4'), ('value', np.float64), ('limit', np.float64) ] )
+
+    def __init__( self, channels: list ):
+        self.__channels = sorted( [ ch for ch in channels if ch.scan ], key=lambda ch: ch.ChannelNumber() )
+        self.__numbers = np.array( [ ch.ChannelNumber() for ch in self.__channels ], dtype=np.int32 )
+        self.__limits = { LIMIT_TYPE.LOW:   self.__Vector( 'limitLow' ),
+                          LIMIT_TYPE.HIGH:  self.__Vector( 'limitHigh' ),
+                          LIMIT_TYPE.RATE:  self.__Vector( 'limitRate' ) }
+        self.__callbacks = []
+        self.__callbackErrors = 0
+        self.__lastCallbackError = None
+        self.Reset()
+
+    #--------------------------------------------
+    def __Vector( self, name: str ) -> np.ndarray:
+        #nan for channels without limit, comparison with nan is always False
+        return np.array( [ np.nan if getattr( ch, name ) == None else getattr( ch, name ) for ch in self.__channels ], dtype=np.float64 )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def channels( self ) -> list:
+        return self.__channels
+
+    @property
+    def events( self ) -> int:
+        return self.__events
+
+    @property
+    def callbackErrors( self ) -> int:
+        #number of exceptions raised by callbacks, the last one is in lastCallbackError
+        return self.__callbackErrors
+
+    @property
+    def lastCallbackError( self ) -> Exception:
+        return self.__lastCallbackError
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def AddCallback( self, function ):
+        #function( events: np.ndarray of EVENT_DTYPE ) called from thread that runs Check (scan drain thread)
+        #exceptions of function are caught and counted (callbackErrors), other callbacks are still called
+        self.__callbacks.append( function )
+
+    #--------------------------------------------
+    def RemoveCallback( self, function ):
+        if( function in self.__callbacks ):
+            self.__callbacks.remove( function )
+
+    #----------------------------------------------------------------------------------------------
+    def Reset( self ):
+        #forgets active alarms and last scan (rate is not checked for first scan after reset)
+        self.__active = { limitType: np.zeros( len(self.__channels), dtype=bool ) for limitType in self.__limits }
+        self.__lastTime = np.nan
+        self.__lastValues = np.full( len(self.__channels), np.nan )
+        self.__events = 0
+
+    #----------------------------------------------------------------------------------------------
+    def GetActiveAlarms( self ) -> list:
+        #list of (channel number, LIMIT_TYPE) which are out of limits in last checked scan
+        return [ ( int( self.__numbers[i] ), limitType ) for limitType, active in self.__active.items() for i in np.nonzero( active )[0] ]
+
+    #----------------------------------------------------------------------------------------------
+    def Check( self, times: np.ndarray, values: np.ndarray ) -> np.ndarray:
+        #times - 1D array of scans time, values - 2D array (row per scan, column per channel)
+        #returns new alarms in block sorted by time, callbacks are called only when there are some
+        times = np.asarray( times, dtype=np.float64 )
+        values = np.asarray( values, dtype=np.float64 ).reshape( len(times), len(self.__channels) )
+        if( len(times) == 0 ): return np.empty( 0, dtype=self.EVENT_DTYPE )
+
+        #rate to previous scan, first scan is compared with last scan of previous block
+        prevValues = np.vstack( ( self.__lastValues, values[:-1] ) )
+        prevTimes = np.concatenate( ( [self.__lastTime], times[:-1] ) )
+        with np.errstate( invalid='ignore', divide='ignore' ):
+            rates = ( values - prevValues ) / ( times - prevTimes )[:, None]
+        self.__lastValues = values[-1].copy()
+        self.__lastTime = times[-1]
+
+        observed = { LIMIT_TYPE.LOW:    values,
+                     LIMIT_TYPE.HIGH:   values,
+                     LIMIT_TYPE.RATE:   rates }
+        with np.errstate( invalid='ignore' ):
+            violations = { LIMIT_TYPE.LOW:  values < self.__limits[LIMIT_TYPE.LOW],
+                           LIMIT_TYPE.HIGH: values > self.__limits[LIMIT_TYPE.HIGH],
+                           LIMIT_TYPE.RATE: np.abs( rates ) > self.__limits[LIMIT_TYPE.RATE] }
+
+        parts = []
+        for limitType, violation in violations.items():
+            #alarm starts where violation is and was not in previous scan
+            previous = np.vstack( ( self.__active[limitType], violation[:-1] ) )
+            scanIdx, chIdx = np.nonzero( violation & ~previous )
+            self.__active[limitType] = violation[-1].copy()
+            if( len(scanIdx) == 0 ): continue
+
+            part = np.zeros( len(scanIdx), dtype=self.EVENT_DTYPE )
+            part['time'] = times[scanIdx]
+            part['channel'] = self.__numbers[chIdx]
+            part['type'] = limitType
+            part['value'] = observed[limitType][scanIdx, chIdx]
+            part['limit'] = self.__limits[limitType][chIdx]
+            parts.append( part )
+
+        if( len(parts) == 0 ): return np.empty( 0, dtype=self.EVENT_DTYPE )
+        events = np.concatenate( parts )
+        events = events[ np.argsort( events['time'], kind='stable' ) ]
+        self.__events += len( events )
+        for function in list( self.__callbacks ):
+            try:
+                function( events )
+            except Exception as e:
+                self.__callbackErrors += 1
+                self.__lastCallbackError = e
+        return events
@@ -1,4 +1,5 @@
 #__init__.py
 
 from .DAQ_3497xA import DAQ_3497xA
-from . import DAQ_channel_config
\ No newline at end of file
+from . import DAQ_channel_config
+from .DAQ_3497xA_group import DAQ_3497xA_Group
@@ -10,6 +10,22 @@
 #   Changelog:
 #      	-2021.11.18		version: 0.1.0
 #      		- Initial class
+#       -2026.10.19     version: 0.2.0
+#           - Batched readout of measurement statistics in one query (GetMeasurementsBulk)
+#       -2026.10.19     version: 0.3.0
+#           - Binary waveform download (CURVe?) to numpy arrays
+#       -2026.10.19     version: 0.4.0
+#           - Continuous waveform streaming (CURVEStream?) to ring buffer in background thread
+#       -2026.10.19     version: 0.5.0
+#           - Periodic measurement sampler with history in TimeSeriesBuffer
+#       -2026.10.19     version: 0.6.0
+#           - Chunked file transfer from/to scope file system (FILESystem:READFile/WRITEFile)
+#       -2026.10.19     version: 0.7.0
+#           - Waiting for end of acquisition with *OPC? and status register, async and future variants
+#       -2026.10.19     version: 0.7.1
+#           - Fix StopCurveStream waiting up to frameTimeout and leaving part of frame in stream when other connection was open
+#       -2026.10.19     version: 0.7.2
+#           - Fix exceptions on wrong record length reply and on more waveform points than declared in preamble
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:
@@ -20,7 +36,15 @@
 #
 
 from ..scpi import SCPI_Socket
+from ..buffers import RingBuffer, TimeSeriesBuffer
+from ..periodic import PeriodicWorker
 from enum import Enum
+import numpy as np
+import threading
+import time
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
 
 class MSO5x:
 
@@ -28,6 +52,21 @@ class MSO5x:
         self.__device = SCPI_Socket( ip, port )
         self.__device.sendDalay = 0.001
 
+        self.__streamThread = None
+        self.__streamStop = threading.Event()
+        self.__streamConnIdx = 0
+        self.__streamBuffer = None
+        self.__streamPreamble = None
+        self.__streamStatistics = None
+
+        self.__sampler = None
+        self.__samplerConnIdx = 0
+        self.__samplerIds = []
+        self.__samplerStats = []
+        self.__samplerHistory = None
+
+        self.__executor = None
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     # BASIC COMMANDS
     #------------------------------------------------------------------------------------------------------------------------------------------------
@@ -85,6 +124,45 @@ class MSO5x:
         self.SetAcquireStopAfter( self.ACQUIRE_STOP_AFTER.SEQUENCE )
         self.SetAcquireState( self.ACQUIRE_STATE.RUN )
 
+    #----------------------------------------------------------------------------------------------
+    def SingleAndWait( self, timeout: float=10.0 ) -> bool:
+        #starts single acquisition and blocks until it is finished (answer to *OPC?) or timeout [s]
+        #single sequence is operation which sets OPC bit only after acquisition is complete
+        command = "ACQ:STOPA SEQUENCE;:ACQ:STATE RUN;*OPC?"                                           #ACQuire:STOPAfter SEQuence;STATE RUN;*OPC?
+        return self.__device.SendCommandGetLine( command, timeout=timeout ) == "1"
+
+    #--------------------------------------------
+    def WaitForOperationComplete( self, timeout: float=10.0 ) -> bool:
+        #blocks until all pending operations (e.g. acquisition started by Single) are finished or timeout [s]
+        return self.__device.SendCommandGetLine( "*OPC?", timeout=timeout ) == "1"
+
+    #--------------------------------------------
+    def SingleAndWaitFuture( self, timeout: float=10.0 ) -> Future:
+        #non blocking variant for threads, result of future is the same as result of SingleAndWait
+        if( self.__executor == None ):
+            self.__executor = ThreadPoolExecutor( max_workers=1 )
+        return self.__executor.submit( self.SingleAndWait, timeout )
+
+    #--------------------------------------------
+    async def SingleAndWaitAsync( self, timeout: float=10.0 ) -> bool:
+        return await asyncio.wrap_future( self.SingleAndWaitFuture( timeout ) )
+
+    #----------------------------------------------------------------------------------------------
+    def SingleWithStatus( self ) -> bool:
+        #starts single acquisition without waiting, end of acquisition is set in event status register (check IsOperationComplete)
+        command = "*CLS;*ESE 1;:ACQ:STOPA SEQUENCE;:ACQ:STATE RUN;*OPC"                                 #*ESE 1 - OPC bit in status byte ESB
+        return self.__device.SendCommand( command ) == 0
+
+    #--------------------------------------------
+    def IsOperationComplete( self ) -> bool:
+        #reading of *ESR? clears register, returns True only once after operation is finished
+        ans = self.__device.SendCommandGetAns( "*ESR?" )
+        if( len(ans) == 0 ): return False
+        try:
+            return ( int( ans ) & 0x01 ) != 0
+        except ValueError:
+            return False
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     # TRIGGER COMMANDS
     #------------------------------------------------------------------------------------------------------------------------------------------------
@@ -245,15 +323,429 @@ class MSO5x:
         connIdx = self.__device.Connect()
         if( connIdx == -1 ): return None
 
-        meas = MSO5x.Measurements( max = self.__GetMeasurementsMax( id, connIdx ),
-                                    mean = self.__GetMeasurementsMean( id, connIdx ),
-                                    min = self.__GetMeasurementsMin( id, connIdx ),
-                                    pk2pk = self.__GetMeasurementsPK2PK( id, connIdx ),
-                                    pop = self.__GetMeasurementsPopulation( id, connIdx ),
-                                    stdDev = self.__GetMeasurementsStdDev( id, connIdx ) )
+        res = self.__GetMeasurementsBulk( [id], list(self.MEASUREMENT_STAT), connIdx )[0]
+        meas = MSO5x.Measurements( max = float( res['maximum'] ),
+                                    mean = float( res['mean'] ),
+                                    min = float( res['minimum'] ),
+                                    pk2pk = float( res['peak2peak'] ),
+                                    pop = float( res['population'] ),
+                                    stdDev = float( res['standardDeviation'] ) )
         self.__device.Close( connIdx )
         return meas
 
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    class MEASUREMENT_STAT( Enum ):
+        MAXIMUM             = 'MAX'
+        MEAN                = 'MEAN'
+        MINIMUM             = 'MIN'
+        PEAK2PEAK           = 'PK2PK'
+        POPULATION          = 'POPU'
+        STANDARD_DEVIATION  = 'STDD'
+
+    #names of fields in array returned by GetMeasurementsBulk - the same as properties of Measurements
+    __MEASUREMENT_FIELD = { MEASUREMENT_STAT.MAXIMUM:               'maximum',
+                            MEASUREMENT_STAT.MEAN:                  'mean',
+                            MEASUREMENT_STAT.MINIMUM:               'minimum',
+                            MEASUREMENT_STAT.PEAK2PEAK:             'peak2peak',
+                            MEASUREMENT_STAT.POPULATION:            'population',
+                            MEASUREMENT_STAT.STANDARD_DEVIATION:    'standardDeviation' }
+
+    #--------------------------------------------
+    def MeasurementsDtype( self, stats: list ) -> np.dtype:
+        return np.dtype( [ ('id', np.int32) ] + [ (self.__MEASUREMENT_FIELD[stat], np.float64) for stat in stats ] )
+
+    #--------------------------------------------
+    def __GetMeasurementsBulk( self, ids: list, stats: list, connIdx: int ) -> np.ndarray:
+        result = np.zeros( len(ids), dtype=self.MeasurementsDtype( stats ) )
+        result['id'] = ids
+        for stat in stats:
+            result[ self.__MEASUREMENT_FIELD[stat] ] = np.nan
+        if( len(ids) == 0 or len(stats) == 0 ): return result
+
+        #all queries concatenated in one message, scope answers with one line with values separated by ';'
+        command = ""
+        for id in ids:
+            for stat in stats:
+                command += ":MEASU:MEAS" + str(id) + ":RESU:ALLA:" + stat.value + "?;"              #MEASUrement:MEAS<x>:RESUlts:ALLAcqs:<stat>?
+        command = command[:-1]
+
+        ans = self.__device.SendCommandGetLine( command, connIdx=connIdx )
+        values = ans.split( ';' )
+        if( len(values) != len(ids)*len(stats) ): return result
+        try:
+            values = np.array( values, dtype=np.float64 ).reshape( len(ids), len(stats) )
+        except ValueError:
+            return result
+
+        for i, stat in enumerate( stats ):
+            result[ self.__MEASUREMENT_FIELD[stat] ] = values[:, i]
+        return result
+
+    #--------------------------------------------
+    def GetMeasurementsBulk( self, ids: list, stats: list=None ) -> np.ndarray:
+        #ids - list of measurement numbers (MEAS<x>), stats - list of MEASUREMENT_STAT, all statistics when None
+        #returns numpy structured array with one row per id: field 'id' and one float field per statistic (names as in Measurements)
+        #values are nan when reading fails
+        if( stats == None ):
+            stats = list( self.MEASUREMENT_STAT )
+        return self.__GetMeasurementsBulk( ids, stats, 0 )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # MEASUREMENT SAMPLING
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def StartMeasurementSampler( self, ids: list, stats: list=None, period: float=1.0, capacity: int=10000 ) -> TimeSeriesBuffer:
+        #reads statistics of measurements ids every period [s] with one query, MEAN when stats is None
+        #history columns are named meas<id>_<field>, e.g. meas1_mean, time is from time.time()
+        #connection is kept between samples but released, so other functions can be used at the same time
+        if( self.__sampler != None
+            and self.__sampler.IsRunning() ):
+            return None
+        if( stats == None ):
+            stats = [ self.MEASUREMENT_STAT.MEAN ]
+
+        columns = []
+        for id in ids:
+            for stat in stats:
+                columns.append( "meas" + str(id) + "_" + self.__MEASUREMENT_FIELD[stat] )
+
+        self.__samplerIds = list( ids )
+        self.__samplerStats = list( stats )
+        self.__samplerConnIdx = 0
+        self.__samplerHistory = TimeSeriesBuffer( capacity, columns )
+        self.__sampler = PeriodicWorker( period, self.__SampleMeasurements )
+        self.__sampler.Start()
+        return self.__samplerHistory
+
+    #--------------------------------------------
+    def __SampleMeasurements( self, tickTime: float ):
+        timestamp = time.time()
+        connIdx = self.__device.Connect( self.__samplerConnIdx )
+        if( connIdx == -1 ):
+            values = np.full( len(self.__samplerHistory.columns), np.nan )
+        else:
+            self.__samplerConnIdx = connIdx
+            res = self.__GetMeasurementsBulk( self.__samplerIds, self.__samplerStats, connIdx )
+            values = np.stack( [ res[ self.__MEASUREMENT_FIELD[stat] ] for stat in self.__samplerStats ], axis=1 ).reshape( -1 )
+            self.__device.Free( connIdx )
+        self.__samplerHistory.AppendSample( timestamp, values )
+
+    #--------------------------------------------
+    def StopMeasurementSampler( self ) -> bool:
+        if( self.__sampler == None ): return False
+        self.__sampler.Stop()
+        if( self.__samplerConnIdx != 0 ):
+            self.__device.Close( self.__samplerConnIdx )
+            self.__samplerConnIdx = 0
+        return True
+
+    #--------------------------------------------
+    def GetMeasurementHistory( self ) -> TimeSeriesBuffer:
+        return self.__samplerHistory
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # WAVEFORM TRANSFER
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    class WAVEFORM_SOURCE( Enum ):
+        CH1     = 'CH1'
+        CH2     = 'CH2'
+        CH3     = 'CH3'
+        CH4     = 'CH4'
+        CH5     = 'CH5'
+        CH6     = 'CH6'
+        CH7     = 'CH7'
+        CH8     = 'CH8'
+        MATH1   = 'MATH1'
+        MATH2   = 'MATH2'
+        MATH3   = 'MATH3'
+        MATH4   = 'MATH4'
+        REF1    = 'REF1'
+        REF2    = 'REF2'
+        REF3    = 'REF3'
+        REF4    = 'REF4'
+
+    #----------------------------------------------------------------------------------------------
+    class WAVEFORM_ENCODING( Enum ):
+        RIBINARY    = 'RIBINARY'            #signed integer, most significant byte first
+        SRIBINARY   = 'SRIBINARY'           #signed integer, least significant byte first
+
+    #----------------------------------------------------------------------------------------------
+    class WaveformPreamble:
+        #scaling of curve data, read once per source from WFMOutpre?
+
+        def __init__( self ):
+            self.byteWidth = 2
+            self.dtype = np.dtype( '>i2' )
+            self.points = 0
+            self.xIncrement = 1.0
+            self.xZero = 0.0
+            self.pointOffset = 0
+            self.yMultiplier = 1.0
+            self.yOffset = 0.0
+            self.yZero = 0.0
+            self.xUnit = ""
+            self.yUnit = ""
+
+        #------------------------------------------------------------------------------------------
+        def Volts( self, raw: np.ndarray ) -> np.ndarray:
+            #works also for 2D array of many frames
+            return ( raw.astype( np.float64 ) - self.yOffset ) * self.yMultiplier + self.yZero
+
+        #------------------------------------------------------------------------------------------
+        def Time( self, length: int ) -> np.ndarray:
+            return self.xZero + ( np.arange( length, dtype=np.float64 ) - self.pointOffset ) * self.xIncrement
+
+    #----------------------------------------------------------------------------------------------
+    class Waveform:
+
+        def __init__( self, source, preamble, raw: np.ndarray ):
+            self.__source = source
+            self.__preamble = preamble
+            self.__raw = raw
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def source( self ):
+            return self.__source
+
+        #-----------------------------------------------------------------
+        @property
+        def preamble( self ):
+            return self.__preamble
+
+        #-----------------------------------------------------------------
+        @property
+        def raw( self ) -> np.ndarray:
+            return self.__raw
+
+        #-----------------------------------------------------------------
+        @property
+        def volts( self ) -> np.ndarray:
+            return self.__preamble.Volts( self.__raw )
+
+        #-----------------------------------------------------------------
+        @property
+        def time( self ) -> np.ndarray:
+            #time of points relative to first point of downloaded window (DATa:STARt)
+            return self.__preamble.Time( len(self.__raw) )
+
+    #----------------------------------------------------------------------------------------------
+    def __GetWaveformPreamble( self, connIdx: int ) -> WaveformPreamble:
+        command = ":WFMO:BYT_N?;:WFMO:BN_F?;:WFMO:BYT_O?;:WFMO:NR_P?;"                              #WFMOutpre:BYT_Nr?;BN_Fmt?;BYT_Or?;NR_Pt?
+        command += ":WFMO:XIN?;:WFMO:XZE?;:WFMO:PT_O?;"                                             #WFMOutpre:XINcr?;XZEro?;PT_Off?
+        command += ":WFMO:YMU?;:WFMO:YOF?;:WFMO:YZE?;:WFMO:XUN?;:WFMO:YUN?"                         #WFMOutpre:YMUlt?;YOFf?;YZEro?;XUNit?;YUNit?
+        ans = self.__device.SendCommandGetLine( command, connIdx=connIdx )
+        values = ans.split( ';' )
+        if( len(values) != 12 ): return None
+
+        pre = self.WaveformPreamble()
+        try:
+            pre.byteWidth = int( values[0] )
+            signed = ( values[1] == 'RI' )
+            bigEndian = ( values[2] == 'MSB' )
+            pre.dtype = np.dtype( ('>' if bigEndian else '<') + ('i' if signed else 'u') + str(pre.byteWidth) )
+            pre.points = int( values[3] )
+            pre.xIncrement = float( values[4] )
+            pre.xZero = float( values[5] )
+            pre.pointOffset = int( float( values[6] ) )
+            pre.yMultiplier = float( values[7] )
+            pre.yOffset = float( values[8] )
+            pre.yZero = float( values[9] )
+            pre.xUnit = values[10].strip( '"' )
+            pre.yUnit = values[11].strip( '"' )
+        except (ValueError, TypeError):
+            return None
+        return pre
+
+    #--------------------------------------------
+    def __GetRecordLength( self, connIdx: int ) -> int:
+        ans = self.__device.SendCommandGetAns( "HOR:RECO?", connIdx=connIdx )                       #HORizontal:RECOrdlength?
+        if( len(ans) == 0 ): return -1
+        try:
+            return int( ans )
+        except ValueError:
+            return -1
+
+    #--------------------------------------------
+    def __SetWaveformWindow( self, source: WAVEFORM_SOURCE, start: int, stop: int, connIdx: int ) -> WaveformPreamble:
+        #select source and data range, returns scaling for whole window or None
+        if( self.__device.SendCommand( "DAT:SOU " + source.value, connIdx=connIdx ) != connIdx ): return None  #DATa:SOUrce
+        if( stop == None ):
+            stop = self.__GetRecordLength( connIdx )
+            if( stop < start ): return None
+
+        command = "DAT:STAR " + str(start) + ";:DAT:STOP " + str(stop)                              #DATa:STARt;STOP
+        if( self.__device.SendCommand( command, connIdx=connIdx ) != connIdx ): return None
+        return self.__GetWaveformPreamble( connIdx )
+
+    #--------------------------------------------
+    def __GetWaveform( self, source: WAVEFORM_SOURCE, start: int, stop: int, chunkSize: int, connIdx: int ) -> Waveform:
+        #scaling is read once for whole window
+        preamble = self.__SetWaveformWindow( source, start, stop, connIdx )
+        if( preamble == None ): return None
+        stop = start + preamble.points - 1
+
+        #long records are read in windows, data is placed directly in preallocated array
+        raw = np.empty( stop-start+1, dtype=preamble.dtype )
+        count = 0
+        chunkStart = start
+        while( chunkStart <= stop ):
+            chunkStop = min( chunkStart+chunkSize-1, stop )
+            command = "DAT:STAR " + str(chunkStart) + ";:DAT:STOP " + str(chunkStop) + ";:CURV?"     #DATa:STARt;STOP;:CURVe?
+            block = self.__device.SendCommandGetBlock( command, connIdx=connIdx )
+            if( len(block) == 0 ): return None
+            if( len(block) % preamble.dtype.itemsize != 0 ): return None                             #not whole points
+            chunk = np.frombuffer( block, dtype=preamble.dtype )
+            if( count + len(chunk) > len(raw) ): return None                                        #more points than in preamble
+            raw[count:count+len(chunk)] = chunk
+            count += len(chunk)
+            if( len(chunk) < chunkStop-chunkStart+1 ): break                                        #record is shorter than requested
+            chunkStart = chunkStop + 1
+
+        return self.Waveform( source, preamble, raw[:count] )
+
+    #--------------------------------------------
+    def __SetWaveformEncoding( self, encoding: WAVEFORM_ENCODING, byteWidth: int, connIdx: int ) -> bool:
+        if( byteWidth != 1 and byteWidth != 2 ): return False
+        command = "DAT:ENC " + encoding.value + ";:WFMO:BYT_N " + str(byteWidth)                     #DATa:ENCdg;:WFMOutpre:BYT_Nr
+        return self.__device.SendCommand( command, connIdx=connIdx ) == connIdx
+
+    #----------------------------------------------------------------------------------------------
+    def GetWaveforms( self, sources: list, start: int=1, stop: int=None,
+                        encoding: WAVEFORM_ENCODING=WAVEFORM_ENCODING.RIBINARY, byteWidth: int=2, chunkSize: int=1000000 ) -> dict:
+        #all sources are downloaded in one connection, stop=None - to end of record
+        #returns dictionary source -> Waveform, empty when download failed
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return {}
+
+        waveforms = {}
+        if( self.__SetWaveformEncoding( encoding, byteWidth, connIdx ) ):
+            for source in sources:
+                waveform = self.__GetWaveform( source, start, stop, chunkSize, connIdx )
+                if( waveform == None ):
+                    waveforms = {}
+                    break
+                waveforms[source] = waveform
+
+        self.__device.Close( connIdx )
+        return waveforms
+
+    #--------------------------------------------
+    def GetWaveform( self, source: WAVEFORM_SOURCE=WAVEFORM_SOURCE.CH1, start: int=1, stop: int=None,
+                        encoding: WAVEFORM_ENCODING=WAVEFORM_ENCODING.RIBINARY, byteWidth: int=2, chunkSize: int=1000000 ) -> Waveform:
+        waveforms = self.GetWaveforms( [source], start, stop, encoding, byteWidth, chunkSize )
+        if( len(waveforms) == 0 ): return None
+        return waveforms[source]
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # WAVEFORM STREAMING
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    class CurveStreamStatistics:
+
+        def __init__( self ):
+            self.framesReceived = 0
+            self.bytesReceived = 0
+            self.malformedFrames = 0                #frames with wrong length
+            self.overwrittenFrames = 0              #frames overwritten in buffer before read
+            self.elapsedTime = 0.0
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def droppedFrames( self ) -> int:
+            return self.malformedFrames + self.overwrittenFrames
+
+        #------------------------------------------------------------------------------------------
+        @property
+        def frameRate( self ) -> float:
+            if( self.elapsedTime <= 0 ): return 0.0
+            return self.framesReceived / self.elapsedTime
+
+        #-----------------------------------------------------------------
+        @property
+        def throughput( self ) -> float:
+            #bytes per second
+            if( self.elapsedTime <= 0 ): return 0.0
+            return self.bytesReceived / self.elapsedTime
+
+    #----------------------------------------------------------------------------------------------
+    def StartCurveStream( self, source: WAVEFORM_SOURCE=WAVEFORM_SOURCE.CH1, start: int=1, stop: int=None,
+                            encoding: WAVEFORM_ENCODING=WAVEFORM_ENCODING.RIBINARY, byteWidth: int=1,
+                            capacity: int=100, frameTimeout: float=30.0 ) -> bool:
+        #every acquisition is sent by scope (CURVEStream?) and stored as raw frame in ring buffer of capacity frames
+        #connection is used only by stream until StopCurveStream, other commands wait for it
+        #frameTimeout - max time [s] between frames, after that stream is finished
+        if( self.IsCurveStreaming() ): return False
+
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+
+        preamble = None
+        if( self.__SetWaveformEncoding( encoding, byteWidth, connIdx ) ):
+            preamble = self.__SetWaveformWindow( source, start, stop, connIdx )
+        if( preamble == None
+            or self.__device.SendCommand( "CURVES?", connIdx=connIdx ) != connIdx ):                #CURVEStream?
+            self.__device.Close( connIdx )
+            return False
+
+        self.__streamConnIdx = connIdx
+        self.__streamPreamble = preamble
+        self.__streamBuffer = RingBuffer( capacity, (preamble.points,), preamble.dtype )
+        self.__streamStatistics = self.CurveStreamStatistics()
+        self.__streamStop.clear()
+        self.__streamThread = threading.Thread( target=self.__CurveStreamLoop, args=(connIdx, frameTimeout), daemon=True )
+        self.__streamThread.start()
+        return True
+
+    #--------------------------------------------
+    def __CurveStreamLoop( self, connIdx: int, frameTimeout: float ):
+        stats = self.__streamStatistics
+        frameLength = self.__streamPreamble.points
+        startTime = time.perf_counter()
+        while( not self.__streamStop.is_set() ):
+            block = self.__device.GetBlock( connIdx=connIdx, timeout=frameTimeout )
+            if( len(block) == 0 ): break                                                            #stopped, timeout or connection lost
+            stats.bytesReceived += len(block)
+            if( len(block) == frameLength * self.__streamPreamble.dtype.itemsize ):
+                self.__streamBuffer.Append( np.frombuffer( block, dtype=self.__streamPreamble.dtype ) )
+                stats.framesReceived += 1
+            else:
+                stats.malformedFrames += 1
+            stats.elapsedTime = time.perf_counter() - startTime
+
+    #--------------------------------------------
+    def StopCurveStream( self ) -> bool:
+        if( self.__streamThread == None ): return False
+        self.__streamStop.set()
+        self.__device.SendCommand( "*CLS", connIdx=self.__streamConnIdx )                           #any command finishes CURVEStream
+        #socket is closed also when other connections are open - unblocks reading thread and drops rest of frame
+        self.__device.Disconnect()
+        self.__streamThread.join( 5.0 )
+        self.__device.Close( self.__streamConnIdx )
+        self.__streamThread = None
+        self.__streamConnIdx = 0
+        return True
+
+    #--------------------------------------------
+    def IsCurveStreaming( self ) -> bool:
+        return ( self.__streamThread != None
+                and self.__streamThread.is_alive() )
+
+    #--------------------------------------------
+    def GetCurveStreamFrames( self, count: int=None ) -> np.ndarray:
+        #takes oldest not read frames (all when count is None) as 2D array of raw data - one row per frame
+        #use GetCurveStreamPreamble().Volts() for scaling
+        if( self.__streamBuffer == None ): return np.empty( (0, 0) )
+        return self.__streamBuffer.Read( count )
+
+    #--------------------------------------------
+    def GetCurveStreamPreamble( self ) -> WaveformPreamble:
+        return self.__streamPreamble
+
+    #--------------------------------------------
+    def GetCurveStreamStatistics( self ) -> CurveStreamStatistics:
+        if( self.__streamStatistics == None ): return None
+        self.__streamStatistics.overwrittenFrames = self.__streamBuffer.overwritten
+        return self.__streamStatistics
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     # SAVE FUNCTIONS
     #------------------------------------------------------------------------------------------------------------------------------------------------
@@ -274,3 +766,127 @@ class MSO5x:
         command = "SAVE:SESSION "                                                                   #SAVE:SESSION <path>
         command += "\"" + path + "\""
         return self.__device.SendCommand( command ) == 0
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    # FILE TRANSFER
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __GetFileSize( self, path: str, connIdx: int ) -> int:
+        #size from long directory list of file folder, current working directory is restored
+        pos = path.rfind( '/' )
+        name = path[pos+1:]
+        directory = ""
+        if( pos != -1 ):
+            directory = self.__device.SendCommandGetLine( "FILES:CWD?", connIdx=connIdx ).strip( '"' )         #FILESystem:CWD?
+            if( len(directory) == 0 ): return -1
+            if( self.__device.SendCommand( "FILES:CWD \"" + path[:pos+1] + "\"", connIdx=connIdx ) != connIdx ): return -1
+
+        ans = self.__device.SendCommandGetLine( "FILES:LDIR?", connIdx=connIdx )                     #FILESystem:LDIR? - "<name>;<type>;<size>;<date>;<time>",...
+        if( pos != -1 ):
+            self.__device.SendCommand( "FILES:CWD \"" + directory + "\"", connIdx=connIdx )
+
+        for entry in re.findall( '"([^"]*)"', ans ):
+            fields = entry.split( ';' )
+            if( len(fields) >= 3
+                and fields[0] == name ):
+                try:
+                    return int( fields[2] )
+                except ValueError:
+                    return -1
+        return -1
+
+    def GetFileSize( self, path: str ) -> int:
+        #path - with "/" as separator, -1 when file is not found
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return -1
+        size = self.__GetFileSize( path, connIdx )
+        self.__device.Close( connIdx )
+        return size
+
+    #----------------------------------------------------------------------------------------------
+    def ReadFile( self, path: str, fileObj, size: int=None, chunkSize: int=262144, progress=None ) -> bool:
+        #copy file from scope to opened binary file object, data goes through memory in chunks of chunkSize bytes
+        #size - file size in bytes, read from scope when None
+        #progress - function( transferredBytes, totalBytes ) called after every chunk
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+
+        if( size == None ):
+            size = self.__GetFileSize( path, connIdx )
+        status = ( size >= 0
+                    and self.__device.SendCommand( "FILES:READF \"" + path + "\"", connIdx=connIdx ) == connIdx )   #FILESystem:READFile
+
+        transferred = 0
+        while( status
+                and transferred < size ):
+            chunk = self.__device.GetExact( min( chunkSize, size-transferred ), connIdx=connIdx )
+            if( len(chunk) == 0 ):
+                status = False
+                break
+            fileObj.write( chunk )
+            transferred += len(chunk)
+            if( progress != None ):
+                progress( transferred, size )
+
+        #synchronize with scope, removes line ending sent after file data
+        if( status ):
+            status = False
+            self.__device.SendCommand( "*OPC?", connIdx=connIdx )
+            for i in range( 2 ):
+                if( self.__device.GetLine( connIdx=connIdx ) == "1" ):
+                    status = True
+                    break
+
+        self.__device.Close( connIdx )
+        return status
+
+    #----------------------------------------------------------------------------------------------
+    def WriteFile( self, path: str, fileObj, size: int=None, chunkSize: int=262144, progress=None ) -> bool:
+        #copy opened binary file object to scope file, data goes through memory in chunks of chunkSize bytes
+        #size - number of bytes to send, rest of file from current position when None
+        if( size == None ):
+            position = fileObj.tell()
+            size = fileObj.seek( 0, 2 ) - position
+            fileObj.seek( position )
+
+        connIdx = self.__device.Connect()
+        if( connIdx == -1 ): return False
+
+        length = str( size )
+        command = "FILES:WRITEF \"" + path + "\",#" + str(len(length)) + length                       #FILESystem:WRITEFile <path>,<block>
+        status = self.__device.SendRaw( command.encode( "UTF-8" ), connIdx=connIdx ) == connIdx
+
+        transferred = 0
+        while( status
+                and transferred < size ):
+            chunk = fileObj.read( min( chunkSize, size-transferred ) )
+            if( len(chunk) == 0 ):
+                status = False
+                break
+            status = self.__device.SendRaw( chunk, connIdx=connIdx ) == connIdx
+            transferred += len(chunk)
+            if( progress != None ):
+                progress( transferred, size )
+
+        #end of message with block and wait for write
+        if( status ):
+            status = ( self.__device.SendCommand( "", connIdx=connIdx ) == connIdx
+                        and self.__device.SendCommandGetLine( "*OPC?", connIdx=connIdx ) == "1" )
+
+        self.__device.Close( connIdx )
+        return status
+
+    #----------------------------------------------------------------------------------------------
+    def DownloadFile( self, path: str, localPath: str, progress=None ) -> bool:
+        try:
+            with open( localPath, 'wb' ) as f:
+                return self.ReadFile( path, f, progress=progress )
+        except OSError:
+            return False
+
+    #--------------------------------------------
+    def UploadFile( self, localPath: str, path: str, progress=None ) -> bool:
+        try:
+            with open( localPath, 'rb' ) as f:
+                return self.WriteFile( path, f, progress=progress )
+        except OSError:
+            return False
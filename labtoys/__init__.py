@@ -4,4 +4,7 @@
 from . import scpi
 from . import logger
 from . import functions
+from . import buffers
+from . import periodic
+from . import poller
 from . import CANoe
@@ -0,0 +1,216 @@
+#buffers.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Preallocated buffers for data acquired in background threads
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class RingBuffer
+#       -2026.10.19     version: 0.2.0
+#           - TimeSeriesBuffer - timestamps with float columns and summary over time window
+#       -2026.10.19     version: 0.2.1
+#           - TimeSeriesBuffer.ExtendSamples for blocks of samples
+#       -2026.10.19     version: 0.2.2
+#           - RingBuffer.GetSnapshot - last items and written counter taken together
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#
+#
+#       Usefull information and links:
+#           numpy   https://numpy.org/doc/stable/
+#
+
+import threading
+import warnings
+import numpy as np
+from numpy.lib import recfunctions
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class RingBuffer:
+    #fixed size buffer of items with the same shape, oldest items are overwritten when buffer is full
+    #writer uses Append/Extend, reader can take new items with Read or look at history with GetLast
+    #all functions are thread safe
+
+    def __init__( self, capacity: int, shape: tuple=(), dtype=np.float64 ):
+        self.__data = np.zeros( (capacity,) + tuple(shape), dtype=dtype )
+        self.__capacity = capacity
+        self.__head = 0                                 #index of next write
+        self.__count = 0                                #items in buffer
+        self.__unread = 0                               #items in buffer not taken by Read
+        self.__written = 0
+        self.__overwritten = 0                          #items lost before Read
+        self.__lock = threading.Lock()
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def capacity( self ) -> int:
+        return self.__capacity
+
+    @property
+    def count( self ) -> int:
+        return self.__count
+
+    @property
+    def unread( self ) -> int:
+        return self.__unread
+
+    @property
+    def written( self ) -> int:
+        return self.__written
+
+    @property
+    def overwritten( self ) -> int:
+        return self.__overwritten
+
+    @property
+    def dtype( self ) -> np.dtype:
+        return self.__data.dtype
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def Append( self, item ):
+        with self.__lock:
+            self.__data[self.__head] = item
+            self.__head = (self.__head + 1) % self.__capacity
+            self.__Written( 1 )
+
+    #----------------------------------------------------------------------------------------------
+    def Extend( self, items: np.ndarray ):
+        items = np.asarray( items )
+        length = len( items )
+        if( length == 0 ): return
+        with self.__lock:
+            #only last items fits in buffer
+            if( length > self.__capacity ):
+                self.__overwritten += length - self.__capacity
+                self.__written += length - self.__capacity
+                items = items[length-self.__capacity:]
+                length = self.__capacity
+
+            #copy in max two slices - to end of array and from begin
+            first = min( length, self.__capacity - self.__head )
+            self.__data[self.__head:self.__head+first] = items[:first]
+            self.__data[:length-first] = items[first:]
+            self.__head = (self.__head + length) % self.__capacity
+            self.__Written( length )
+
+    #--------------------------------------------
+    def __Written( self, length: int ):
+        self.__written += length
+        self.__count = min( self.__count + length, self.__capacity )
+        self.__unread += length
+        if( self.__unread > self.__capacity ):
+            self.__overwritten += self.__unread - self.__capacity
+            self.__unread = self.__capacity
+
+    #----------------------------------------------------------------------------------------------
+    def __Ordered( self, length: int ) -> np.ndarray:
+        #copy of last length items, from oldest to newest
+        start = self.__head - length
+        if( start >= 0 ):
+            return self.__data[start:self.__head].copy()
+        return np.concatenate( (self.__data[start:], self.__data[:self.__head]) )
+
+    #----------------------------------------------------------------------------------------------
+    def GetLast( self, length: int=None ) -> np.ndarray:
+        #copy of last items (all when length is None) from oldest to newest, does not change unread items
+        with self.__lock:
+            if( length == None
+                or length > self.__count ):
+                length = self.__count
+            return self.__Ordered( length )
+
+    #----------------------------------------------------------------------------------------------
+    def GetSnapshot( self, length: int=None ) -> tuple:
+        #( GetLast( length ), written ) taken under one lock, so written counter matches items when writer is running
+        with self.__lock:
+            if( length == None
+                or length > self.__count ):
+                length = self.__count
+            return ( self.__Ordered( length ), self.__written )
+
+    #----------------------------------------------------------------------------------------------
+    def Read( self, length: int=None ) -> np.ndarray:
+        #take oldest unread items (all when length is None)
+        with self.__lock:
+            if( length == None
+                or length > self.__unread ):
+                length = self.__unread
+            res = self.__Ordered( self.__unread )[:length]
+            self.__unread -= length
+            return res
+
+    #----------------------------------------------------------------------------------------------
+    def Clear( self ):
+        with self.__lock:
+            self.__head = 0
+            self.__count = 0
+            self.__unread = 0
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class TimeSeriesBuffer( RingBuffer ):
+    #ring buffer of samples: field 'time' and one float64 field per column
+    #samples have to be appended with growing time
+
+    def __init__( self, capacity: int, columns: list ):
+        self.__columns = list( columns )
+        super().__init__( capacity, (), [ ('time', np.float64) ] + [ (name, np.float64) for name in self.__columns ] )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def columns( self ) -> list:
+        return self.__columns
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def AppendSample( self, timestamp: float, values ):
+        self.Append( (timestamp, *values) )
+
+    #----------------------------------------------------------------------------------------------
+    def ExtendSamples( self, timestamps: np.ndarray, values: np.ndarray ):
+        #values - 2D array, row per sample, column per buffer column
+        samples = np.zeros( len(timestamps), dtype=self.dtype )
+        samples['time'] = timestamps
+        for i, name in enumerate( self.__columns ):
+            samples[name] = values[:, i]
+        self.Extend( samples )
+
+    #----------------------------------------------------------------------------------------------
+    def GetWindow( self, start: float=None, stop: float=None ) -> np.ndarray:
+        #samples with start <= time < stop, None - no limit
+        samples = self.GetLast()
+        first = 0
+        last = len( samples )
+        if( start != None ):
+            first = np.searchsorted( samples['time'], start, side='left' )
+        if( stop != None ):
+            last = np.searchsorted( samples['time'], stop, side='left' )
+        return samples[first:last]
+
+    #----------------------------------------------------------------------------------------------
+    def Values( self, samples: np.ndarray ) -> np.ndarray:
+        #2D array of column values (rows - samples) without time
+        if( len(self.__columns) == 0 ): return np.empty( (len(samples), 0) )
+        return recfunctions.structured_to_unstructured( samples[self.__columns], dtype=np.float64 )
+
+    #----------------------------------------------------------------------------------------------
+    def Summary( self, start: float=None, stop: float=None ) -> dict:
+        #statistics of every column in time window, arrays in order of columns, nan values are skipped
+        values = self.Values( self.GetWindow( start, stop ) )
+        res = { 'count': np.count_nonzero( ~np.isnan( values ), axis=0 ) }
+        if( len(values) == 0 ):
+            for name in ( 'mean', 'std', 'min', 'max' ):
+                res[name] = np.full( len(self.__columns), np.nan )
+            return res
+
+        #columns with only nan values give nan without warning
+        with warnings.catch_warnings():
+            warnings.simplefilter( 'ignore', category=RuntimeWarning )
+            res['mean'] = np.nanmean( values, axis=0 )
+            res['std'] = np.nanstd( values, axis=0 )
+            res['min'] = np.nanmin( values, axis=0 )
+            res['max'] = np.nanmax( values, axis=0 )
+        return res
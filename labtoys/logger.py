@@ -1,4 +1,4 @@
-#scpi.py
+#logger.py
 #   Created on:	2021.10.25
 #       Author: ppudo
 #       e-mail:	ppudo@outlook.com
@@ -12,6 +12,14 @@
 #      		- Initial class
 #       -2021.11.15     version: 0.2.0
 #           - Changes for more options
+#       -2026.10.19     version: 0.3.0
+#           - One buffered file handle flushed by lines, bytes or time (optional fsync) instead of reopening of file
+#           - Fix file handles leak in __ReOpen (CloseFile was not called), context manager
+#       -2026.10.19     version: 0.3.1
+#           - Time flush from timer started with first not saved line, also when logging pauses
+#       -2026.10.19     version: 0.3.2
+#           - One flusher thread waiting for deadline of not saved lines instead of timer thread per flush
+#           - bufferSize as constructor argument
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:         
@@ -22,10 +30,13 @@
 from datetime import datetime
 from genericpath import exists
 import os
+import threading
+import time
+import weakref
 
 class Logger:
 
-    def __init__( self, filePath: str ):
+    def __init__( self, filePath: str, bufferSize: int=65536 ):
         self.__fileFullPath = filePath 
         if( not os.path.isabs(filePath) ):
             self.__fileFullPath = os.path.abspath(filePath)
@@ -52,12 +63,20 @@ class Logger:
                 #print( "create dir: " + testPath )
 
         self.__file = None
+        self.__bufferSize = bufferSize                  #[B] of file buffer
         self.__OpenFile()
 
         #init variables
-        self.maxUnsaved = 10
+        self.maxUnsaved = 10                            #lines written to file before flush
+        self.maxUnsavedBytes = 65536
+        self.maxUnsavedTime = 5.0                       #[s] from first not flushed line, flushed by flusher thread
+        self.fsync = False                              #flush also from system cache to disk (slower)
         self.maxLines = 10000
         self.__unsaved = 0
+        self.__unsavedBytes = 0
+        self.__flushDeadline = None                     #time.monotonic() when not saved lines have to be flushed
+        self.__lock = threading.RLock()
+        self.__flushCondition = threading.Condition( self.__lock )
         self.__linesInFile = 0
         self.__allLines = 0
         self.__fileIdx = 0
@@ -74,6 +93,9 @@ class Logger:
         self.includeIdx = False
         self.includeTimeFromStart = False
 
+        self.__flushThread = threading.Thread( target=Logger.__FlushLoop, args=( weakref.ref( self ), self.__flushCondition ), daemon=True )
+        self.__flushThread.start()
+
     #------------------------------------------------------------------------------------------------------------------------------------------------
     @property
     def path( self ):
@@ -87,32 +109,62 @@ class Logger:
     def allLines( self ):
         return self.__allLines
 
+    @property
+    def bufferSize( self ):
+        return self.__bufferSize
+
     #---------------------------------------------------------------------
     @property
     def headers( self ):
         return self.__headers
 
     #------------------------------------------------------------------------------------------------------------------------------------------------
-    def __WriteLine( self, line: str, reOpen: bool = False ) -> bool:
+    def __WriteLine( self, line: str, flush: bool = False ) -> bool:
         line = line + self.lineEnding
-        self.__unsaved += 1
-        try:
-            self.__file.write( line )
-        except:
-            return False
+        with self.__lock:
+            try:
+                self.__file.write( line )
+            except:
+                return False
 
-        self.__allLines += 1
-        self.__linesInFile += 1
-        if( self.__unsaved >= self.maxUnsaved
-            or reOpen ):
-            self.__unsaved = 0
-            return self.__ReOpen()
-        return True
+            self.__unsaved += 1
+            self.__unsavedBytes += len( line )
+            self.__allLines += 1
+            self.__linesInFile += 1
+            if( flush
+                or self.__unsaved >= self.maxUnsaved
+                or self.__unsavedBytes >= self.maxUnsavedBytes ):
+                return self.Flush()
+
+            #first not saved line sets deadline for flusher thread, so line waits max maxUnsavedTime even when next line does not come
+            if( self.__flushDeadline == None ):
+                self.__flushDeadline = time.monotonic() + self.maxUnsavedTime
+                self.__flushCondition.notify()
+            return True
+
+    #--------------------------------------------
+    @staticmethod
+    def __FlushLoop( loggerRef: weakref.ref, condition: threading.Condition ):
+        #only weak reference is kept while waiting, so logger not closed by user is still collected (__del__ closes file)
+        with condition:
+            while( True ):
+                logger = loggerRef()
+                if( logger == None
+                    or logger.__file == None ):
+                    return
+                timeout = None
+                if( logger.__flushDeadline != None ):
+                    timeout = logger.__flushDeadline - time.monotonic()
+                    if( timeout <= 0 ):
+                        logger.Flush()
+                        timeout = None
+                del logger
+                condition.wait( timeout )
 
     #----------------------------------------------------------------------------------------------
     def __OpenFile( self ) -> bool:
         try:
-            self.__file = open( self.__fileFullPath, 'a' )
+            self.__file = open( self.__fileFullPath, 'a', buffering=self.__bufferSize )
         except Exception as e:
             #print( e.args )
             self.__file = None
@@ -120,15 +172,49 @@ class Logger:
         return True  
 
     #----------------------------------------------------------------------------------------------
-    def __ReOpen( self ) -> bool:
-        #print( "Re open" )
-        self.CloseFile
-        return self.__OpenFile()
+    def Flush( self ) -> bool:
+        #written lines go to file (and to disk when fsync is set)
+        with self.__lock:
+            self.__flushDeadline = None
+            if( self.__file == None ): return False
+            try:
+                self.__file.flush()
+                if( self.fsync ):
+                    os.fsync( self.__file.fileno() )
+            except OSError:
+                return False
+            self.__unsaved = 0
+            self.__unsavedBytes = 0
+            return True
 
     #----------------------------------------------------------------------------------------------
     def CloseFile( self ):
-        self.__file.close()
-        self.__file = None
+        #can be called many times, not saved lines are flushed before close, flusher thread is stopped
+        with self.__lock:
+            if( self.__file == None ): return
+            self.Flush()
+            try:
+                self.__file.close()
+            except OSError:
+                pass
+            self.__file = None
+            self.__flushCondition.notify()
+        if( self.__flushThread != threading.current_thread() ):
+            self.__flushThread.join()
+
+    #--------------------------------------------
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, excType, excValue, traceback ):
+        self.CloseFile()
+        return False
+
+    def __del__( self ):
+        try:
+            self.CloseFile()
+        except AttributeError:
+            pass                                        #object not completely created
 
     #----------------------------------------------------------------------------------------------
     def MakeHeaders( self, columnsNames: list ) -> bool:
@@ -0,0 +1,120 @@
+#periodic.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Background thread calling function with constant period
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class
+#       -2026.10.19     version: 0.1.1
+#           - Exceptions of function are caught and counted, thread does not stop on them
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#
+#
+#       Usefull information and links:
+#
+
+import threading
+import time
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class PeriodicWorker:
+    #calls function( tickTime ) every period [s] in own thread
+    #ticks are planned from start time (start + n*period) so delay of one call does not shift next ones
+    #when call takes longer than period, missed ticks are skipped and counted
+    #exception of function does not stop the thread, it is counted and the last one is kept
+
+    def __init__( self, period: float, function ):
+        self.__period = period
+        self.__function = function
+        self.__thread = None
+        self.__stop = threading.Event()
+
+        self.__ticks = 0
+        self.__missedTicks = 0
+        self.__maxLateness = 0.0
+        self.__errors = 0
+        self.__lastError = None
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    @property
+    def period( self ) -> float:
+        return self.__period
+
+    @property
+    def ticks( self ) -> int:
+        return self.__ticks
+
+    @property
+    def missedTicks( self ) -> int:
+        return self.__missedTicks
+
+    @property
+    def maxLateness( self ) -> float:
+        return self.__maxLateness
+
+    @property
+    def errors( self ) -> int:
+        return self.__errors
+
+    @property
+    def lastError( self ) -> Exception:
+        return self.__lastError
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def Start( self ) -> bool:
+        if( self.IsRunning() ): return False
+        self.__stop.clear()
+        self.__ticks = 0
+        self.__missedTicks = 0
+        self.__maxLateness = 0.0
+        self.__errors = 0
+        self.__lastError = None
+        self.__thread = threading.Thread( target=self.__Loop, daemon=True )
+        self.__thread.start()
+        return True
+
+    #----------------------------------------------------------------------------------------------
+    def Stop( self, timeout: float=None ) -> bool:
+        if( self.__thread == None ): return False
+        self.__stop.set()
+        if( self.__thread != threading.current_thread() ):
+            self.__thread.join( timeout )
+        return not self.__thread.is_alive()
+
+    #----------------------------------------------------------------------------------------------
+    def IsRunning( self ) -> bool:
+        return ( self.__thread != None
+                and self.__thread.is_alive() )
+
+    #----------------------------------------------------------------------------------------------
+    def __Loop( self ):
+        startTime = time.perf_counter()
+        tick = 0
+        while( not self.__stop.is_set() ):
+            tickTime = startTime + tick * self.__period
+            now = time.perf_counter()
+            if( now < tickTime ):
+                if( self.__stop.wait( tickTime - now ) ): break
+            else:
+                self.__maxLateness = max( self.__maxLateness, now - tickTime )
+
+            try:
+                self.__function( tickTime )
+            except Exception as e:
+                self.__errors += 1
+                self.__lastError = e
+            self.__ticks += 1
+
+            #next tick, skip these which are already in the past
+            tick += 1
+            late = int( (time.perf_counter() - startTime) / self.__period ) + 1 - tick
+            if( late > 1 ):
+                self.__missedTicks += late - 1
+                tick += late - 1
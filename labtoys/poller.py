@@ -0,0 +1,262 @@
+#poller.py
+#   Created on:	2026.10.19
+#       Author: ppudo
+#       e-mail:	ppudo@outlook.com
+#
+#   Project: 	labtoys
+#   Description: 	Polling of many devices from one thread - all queries are send at once and replies are collected as they come
+#
+#
+#   Changelog:
+#      	-2026.10.19		version: 0.1.0
+#      		- Initial class
+#
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+#       Idea and changes proposal:
+#
+#
+#       Usefull information and links:
+#           selectors library  https://docs.python.org/3/library/selectors.html
+#
+
+from .periodic import PeriodicWorker
+import errno
+import selectors
+import socket
+import threading
+import time
+
+#----------------------------------------------------------------------------------------------------------------------------------------------------
+class Poller:
+    #keeps connection to every endpoint and sends its queries in every Poll, all endpoints are served at the same time
+    #so refresh of all endpoints takes about the time of the slowest one, not sum of all
+    #device which accepts only one connection (e.g. CTS chamber) can't be used by its class when it is added to poller
+
+    class Endpoint:
+
+        def __init__( self, name: str, ip: str, port: int, queries: list, lineEnding: str, pipelined: bool ):
+            self.name = name
+            self.ip = ip
+            self.port = port
+            self.lineEnding = lineEnding
+            self.pipelined = pipelined                  #all queries in one write, otherwise next query after reply of previous
+            #(command, reply length), reply length None - reply ends with line ending
+            self.queries = [ (query, None) if isinstance( query, str ) else tuple( query ) for query in queries ]
+
+            self.sock = None
+            self.connected = False
+            self.rxBuffer = bytearray()
+            self.txBuffer = bytearray()
+            self.replies = []
+            self.nextQuery = 0                          #index of next query to send
+            self.nextReply = 0                          #index of next expected reply
+            self.errors = 0
+
+        #------------------------------------------------------------------------------------------
+        def IsDone( self ) -> bool:
+            return self.nextReply >= len(self.queries)
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __init__( self, timeout: float=3.0 ):
+        self.timeout = timeout                          #[s] for whole Poll
+        self.__endpoints = {}
+        self.__selector = selectors.DefaultSelector()
+        self.__lock = threading.Lock()
+
+        self.__worker = None
+        self.__lastResults = {}
+        self.__lastTime = float( 'nan' )
+        self.__callbacks = []
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def AddEndpoint( self, name: str, ip: str, port: int, queries: list, lineEnding: str="\n", pipelined: bool=True ) -> bool:
+        #queries - list of commands (reply ends with lineEnding) or (command, reply length in bytes) for fixed length replies
+        #devices without line ending (CTS: lineEnding="", queries [("A0", 14), ("U1", 14)]) have to use pipelined=False
+        with self.__lock:
+            if( name in self.__endpoints ): return False
+            self.__endpoints[name] = self.Endpoint( name, ip, port, queries, lineEnding, pipelined )
+            return True
+
+    #--------------------------------------------
+    def RemoveEndpoint( self, name: str ) -> bool:
+        with self.__lock:
+            endpoint = self.__endpoints.pop( name, None )
+            if( endpoint == None ): return False
+            self.__Disconnect( endpoint )
+            return True
+
+    #--------------------------------------------
+    def Close( self ):
+        with self.__lock:
+            for endpoint in self.__endpoints.values():
+                self.__Disconnect( endpoint )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def __Connect( self, endpoint: Endpoint ):
+        #non blocking connect, end of connecting is reported as write event
+        endpoint.sock = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+        endpoint.sock.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+        endpoint.sock.setblocking( False )
+        endpoint.connected = False
+        endpoint.rxBuffer.clear()
+        err = endpoint.sock.connect_ex( ( endpoint.ip, endpoint.port ) )
+        if( err not in ( 0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr( errno, 'WSAEWOULDBLOCK', -1 ) ) ):
+            self.__Disconnect( endpoint )
+            return
+        self.__selector.register( endpoint.sock, selectors.EVENT_WRITE, endpoint )
+
+    #--------------------------------------------
+    def __Disconnect( self, endpoint: Endpoint ):
+        if( endpoint.sock == None ): return
+        try:
+            self.__selector.unregister( endpoint.sock )
+        except ( KeyError, ValueError ):
+            pass
+        endpoint.sock.close()
+        endpoint.sock = None
+        endpoint.connected = False
+
+    #--------------------------------------------
+    def __Fail( self, endpoint: Endpoint ):
+        #stream can't be trusted after error, connection is created again in next Poll
+        endpoint.errors += 1
+        endpoint.nextReply = len(endpoint.queries)
+        self.__Disconnect( endpoint )
+
+    #--------------------------------------------
+    def __QueueQueries( self, endpoint: Endpoint ):
+        #all queries or only next one, depending on endpoint
+        last = len(endpoint.queries) if endpoint.pipelined else min( endpoint.nextQuery + 1, len(endpoint.queries) )
+        for command, length in endpoint.queries[endpoint.nextQuery:last]:
+            endpoint.txBuffer += ( command + endpoint.lineEnding ).encode( "UTF-8" )
+        endpoint.nextQuery = last
+        if( len(endpoint.txBuffer) > 0 and endpoint.connected ):
+            self.__selector.modify( endpoint.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, endpoint )
+
+    #--------------------------------------------
+    def __Write( self, endpoint: Endpoint ):
+        if( not endpoint.connected ):
+            if( endpoint.sock.getsockopt( socket.SOL_SOCKET, socket.SO_ERROR ) != 0 ):
+                self.__Fail( endpoint )
+                return
+            endpoint.connected = True
+
+        if( len(endpoint.txBuffer) > 0 ):
+            try:
+                sent = endpoint.sock.send( endpoint.txBuffer )
+            except ( BlockingIOError, InterruptedError ):
+                return
+            except OSError:
+                self.__Fail( endpoint )
+                return
+            del endpoint.txBuffer[:sent]
+        if( len(endpoint.txBuffer) == 0 ):
+            self.__selector.modify( endpoint.sock, selectors.EVENT_READ, endpoint )
+
+    #--------------------------------------------
+    def __Read( self, endpoint: Endpoint ):
+        try:
+            data = endpoint.sock.recv( 65536 )
+        except ( BlockingIOError, InterruptedError ):
+            return
+        except OSError:
+            self.__Fail( endpoint )
+            return
+        if( len(data) == 0 ):
+            self.__Fail( endpoint )                                                                 #closed by device
+            return
+        endpoint.rxBuffer += data
+
+        #take all complete replies from buffer
+        terminator = endpoint.lineEnding.encode( "UTF-8" ) or b"\n"
+        while( not endpoint.IsDone() ):
+            command, length = endpoint.queries[endpoint.nextReply]
+            if( length != None ):
+                if( len(endpoint.rxBuffer) < length ): break
+                reply = endpoint.rxBuffer[:length]
+                del endpoint.rxBuffer[:length]
+            else:
+                pos = endpoint.rxBuffer.find( terminator )
+                if( pos == -1 ): break
+                reply = endpoint.rxBuffer[:pos]
+                del endpoint.rxBuffer[:pos+len(terminator)]
+            endpoint.replies[endpoint.nextReply] = reply.decode( "UTF-8", errors="replace" ).rstrip()
+            endpoint.nextReply += 1
+            if( endpoint.nextQuery < len(endpoint.queries) ):
+                self.__QueueQueries( endpoint )
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def Poll( self ) -> dict:
+        #name -> list of replies in order of queries, "" for reply not received (error or timeout)
+        with self.__lock:
+            endpoints = list( self.__endpoints.values() )
+            for endpoint in endpoints:
+                endpoint.replies = [ "" ] * len(endpoint.queries)
+                endpoint.nextQuery = 0
+                endpoint.nextReply = 0
+                endpoint.txBuffer.clear()
+                if( endpoint.sock == None ):
+                    self.__Connect( endpoint )
+                if( endpoint.sock == None ):
+                    self.__Fail( endpoint )
+                    continue
+                endpoint.rxBuffer.clear()
+                self.__QueueQueries( endpoint )
+
+            deadline = time.monotonic() + self.timeout
+            while( not all( endpoint.IsDone() for endpoint in endpoints ) ):
+                remaining = deadline - time.monotonic()
+                if( remaining <= 0 ): break
+                for key, mask in self.__selector.select( remaining ):
+                    endpoint = key.data
+                    if( endpoint.sock == None ): continue
+                    if( mask & selectors.EVENT_WRITE ):
+                        self.__Write( endpoint )
+                    if( endpoint.sock != None
+                        and mask & selectors.EVENT_READ ):
+                        self.__Read( endpoint )
+
+            #late replies would mix with next poll
+            for endpoint in endpoints:
+                if( not endpoint.IsDone() ):
+                    self.__Fail( endpoint )
+
+            self.__lastResults = { endpoint.name: endpoint.replies for endpoint in endpoints }
+            self.__lastTime = time.time()
+            return self.__lastResults
+
+    #--------------------------------------------
+    def GetErrors( self ) -> dict:
+        #name -> number of failed polls
+        with self.__lock:
+            return { name: endpoint.errors for name, endpoint in self.__endpoints.items() }
+
+    #------------------------------------------------------------------------------------------------------------------------------------------------
+    def AddCallback( self, function ):
+        #function( time: float, results: dict ) called after every poll of Start
+        self.__callbacks.append( function )
+
+    #--------------------------------------------
+    def Start( self, period: float ) -> bool:
+        #Poll every period [s] in background
+        if( self.__worker != None
+            and self.__worker.IsRunning() ):
+            return False
+        self.__worker = PeriodicWorker( period, self.__PollTick )
+        return self.__worker.Start()
+
+    #--------------------------------------------
+    def __PollTick( self, tickTime: float ):
+        results = self.Poll()
+        for function in list( self.__callbacks ):
+            function( self.__lastTime, results )
+
+    #--------------------------------------------
+    def Stop( self ) -> bool:
+        if( self.__worker == None ): return False
+        return self.__worker.Stop()
+
+    #--------------------------------------------
+    def GetLastResults( self ) -> tuple:
+        #( time.time() of last poll, results of last poll )
+        return ( self.__lastTime, self.__lastResults )
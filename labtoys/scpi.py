@@ -18,6 +18,15 @@
 #           - Fix bugs from GetAnd ('\n' on the end). Add close counter for auto refresh functions. - bugs from c# code version
 #       -2021.11.08     version: 0.3.0
 #           - Add connection idx's like in C# version
+#       -2026.10.19     version: 0.4.0
+#           - Add receive buffer and GetLine for reading replies terminated by line ending (batched queries)
+#       -2026.10.19     version: 0.4.1
+#           - Add GetExact and GetBlock (IEEE 488.2 definite length block) for binary transfers
+#       -2026.10.19     version: 0.4.2
+#           - Fix growing stay connected list when connection is recalled with Connect( oldIdx ) and not removed on Close
+#       -2026.10.19     version: 0.4.3
+#           - Socket is closed and receive buffer cleared after send/receive error or timeout, also when other connections are open
+#             (late replies were read as answers to next queries), Disconnect for the same from device classes
 #
 #----------------------------------------------------------------------------------------------------------------------------------------------------
 #       Idea and changes proposal:
@@ -49,12 +58,16 @@ class SCPI_Socket:
         self.__freeConnectionList = list()
         self.__connectionWaitTime = 0.005
 
+        self.__rxBuffer = bytearray()
+
     #----------------------------------------------------------------------------------------------
     def __ConnectInternal( self, stayConnected=False, oldIdx=0 ) -> int:
         idx = 0
         #recall old socket idx if oldIdx is in use
         if( oldIdx != 0 ):
-            if oldIdx in self.__freeConnectionList:
+            if oldIdx in self.__connectionList:
+                idx = oldIdx                                                                        #socket was closed by Disconnect or error
+            elif oldIdx in self.__freeConnectionList:
                 idx = oldIdx
                 self.__connectionList.append( idx )
                 self.__freeConnectionList.remove( idx )
@@ -79,10 +92,13 @@ class SCPI_Socket:
                 #print( "Error: ", err[0] )
                 self.__connectionList.remove( idx )
                 self.__devSocket = None
+                if( self.__currentConnectionIdx == idx ):
+                    self.__currentConnectionIdx = self.__connectionList[0] if len(self.__connectionList) > 0 else 0
                 return -1
 
         #save stay connected state
-        if( stayConnected ):
+        if( stayConnected
+            and not (idx in self.__stayConnected) ):
             self.__stayConnected.append( idx )
 
         #check for currenct connection idx
@@ -109,9 +125,7 @@ class SCPI_Socket:
             and len(self.__connectionList) == 0
             and len(self.__freeConnectionList) == 0 ):
             if( self.__devSocket != None ):
-                self.__devSocket.shutdown( socket.SHUT_RDWR )
-                self.__devSocket.close()
-                self.__devSocket = None
+                self.__CloseSocket( self.__devSocket )
                 time.sleep( self.closeDelay )
             #print( "Dispose scoket" )
 
@@ -124,13 +138,33 @@ class SCPI_Socket:
 
         #remove this index from stay connected idx's
         try:
-            self.__connectionList.remove( connIdx )
+            self.__stayConnected.remove( connIdx )
         except ValueError:
             pass
             
         #print( "Close idx: " + str(connIdx) )
         return
 
+    #----------------------------------------------------------------------------------------------
+    def Disconnect( self ):
+        #closes socket and clears receive buffer, connection idx's stay valid and socket is created again on next send
+        #for cases when stream can't be trusted - replies or data which can come later would be read by next query
+        self.__CloseSocket( self.__devSocket )
+
+    #--------------------------------------------
+    def __CloseSocket( self, sock: socket.socket ):
+        #only when sock is still current socket, it could be already created again by other connection
+        if( sock == None
+            or sock is not self.__devSocket ):
+            return
+        self.__devSocket = None
+        self.__rxBuffer.clear()
+        try:
+            sock.shutdown( socket.SHUT_RDWR )
+        except OSError:
+            pass
+        sock.close()
+
     #----------------------------------------------------------------------------------------------
     def Free( self, connIdx: int):
         status = True
@@ -165,8 +199,9 @@ class SCPI_Socket:
             time.sleep( self.__connectionWaitTime )
 
         #try to send message
+        sock = self.__devSocket
         try:
-            self.__devSocket.sendall( data )
+            sock.sendall( data )
             time.sleep( self.sendDalay )
             if( stayConnected == False
                 and not (connIdx in self.__stayConnected) ):
@@ -175,6 +210,7 @@ class SCPI_Socket:
         except:
             #err = sys.exc_info()
             #print( "Error: ", err[0] )
+            self.__CloseSocket( sock )
             self.Close( connIdx )
             return -1
 
@@ -192,9 +228,14 @@ class SCPI_Socket:
             and connIdx == 0 ):
             return []
 
-        #try to receive message
+        #try to receive message, data left in buffer by GetLine goes first
+        sock = self.__devSocket
         try:
-            res = self.__devSocket.recv( respondLength )
+            if( len(self.__rxBuffer) > 0 ):
+                res = bytes( self.__rxBuffer[:respondLength] )
+                del self.__rxBuffer[:respondLength]
+            else:
+                res = sock.recv( respondLength )
             if( stayConnected == False
                 and not (connIdx in self.__stayConnected) ):
                 self.Close( connIdx )
@@ -202,6 +243,7 @@ class SCPI_Socket:
         except:
             #err = sys.exc_info()
             #print( "Error: ", err[0] )
+            self.__CloseSocket( sock )                                                              #late reply would be read by next query
             self.Close( connIdx )
             return []
 
@@ -219,6 +261,112 @@ class SCPI_Socket:
 
         return res
 
+    #----------------------------------------------------------------------------------------------
+    def __ReceiveUntil( self, terminator: bytes ) -> bytes:
+        #read from socket until terminator, everything after terminator stays in buffer for next read
+        while( True ):
+            pos = self.__rxBuffer.find( terminator )
+            if( pos != -1 ):
+                res = bytes( self.__rxBuffer[:pos] )
+                del self.__rxBuffer[:pos+len(terminator)]
+                return res
+            data = self.__devSocket.recv( 4096 )
+            if( len(data) == 0 ):
+                raise ConnectionError( "Connection closed by device" )
+            self.__rxBuffer += data
+
+    #----------------------------------------------------------------------------------------------
+    def __ReceiveExact( self, length: int ) -> bytearray:
+        #read exactly length bytes, data is received directly to preallocated buffer
+        res = bytearray( length )
+        view = memoryview( res )
+        count = min( length, len(self.__rxBuffer) )
+        view[:count] = self.__rxBuffer[:count]
+        del self.__rxBuffer[:count]
+        while( count < length ):
+            received = self.__devSocket.recv_into( view[count:] )
+            if( received == 0 ):
+                raise ConnectionError( "Connection closed by device" )
+            count += received
+        return res
+
+    #----------------------------------------------------------------------------------------------
+    def __ReceiveBlock( self, terminated: bool ) -> bytearray:
+        header = self.__ReceiveExact( 2 )                                                           #begin of header #x - where x is length of rest of header
+        if( header[0:1] != b"#" ):
+            raise ValueError( "Not a block data" )
+        lengthDigits = int( header[1:2] )
+        if( lengthDigits == 0 ):
+            raise ValueError( "Indefinite length block is not supported" )
+        length = int( self.__ReceiveExact( lengthDigits ) )
+        data = self.__ReceiveExact( length )
+
+        #remove ending after block, if it is something else it stays for next read
+        terminator = self.lineEnding.encode( "UTF-8" )
+        if( terminated
+            and len(terminator) > 0 ):
+            ending = self.__ReceiveExact( len(terminator) )
+            if( ending != terminator ):
+                self.__rxBuffer[0:0] = ending
+        return data
+
+    #----------------------------------------------------------------------------------------------
+    def __ReceiveWith( self, receiver, stayConnected: bool, connIdx: int, timeout=None ):
+        #common part of buffered reads - temporary timeout and closing of connection, returns None on error
+        #after error or timeout socket is closed, rest of reply can't be separated from next replies
+        if( self.__devSocket == None
+            and connIdx == 0 ):
+            return None
+
+        sock = self.__devSocket
+        try:
+            if( timeout != None ):
+                self.__devSocket.settimeout( timeout )
+            try:
+                res = receiver()
+            finally:
+                if( timeout != None
+                    and self.__devSocket != None ):
+                    self.__devSocket.settimeout( self.timeout )
+            if( stayConnected == False
+                and not (connIdx in self.__stayConnected) ):
+                self.Close( connIdx )
+                connIdx = 0
+        except:
+            self.__CloseSocket( sock )
+            self.Close( connIdx )
+            return None
+
+        return res
+
+    #----------------------------------------------------------------------------------------------
+    def GetLine( self, stayConnected=False, connIdx=0, timeout=None ) -> str:
+        #unlike GetAns reads whole reply even if it comes in many packets - for long answers of batched queries
+        #timeout - optional timeout [s] only for this read, default is self.timeout
+        terminator = self.lineEnding.encode( "UTF-8" )
+        if( len(terminator) == 0 ):
+            terminator = b"\n"
+
+        res = self.__ReceiveWith( lambda: self.__ReceiveUntil( terminator ), stayConnected, connIdx, timeout )
+        if( res == None ):
+            return ""
+        return res.decode( "UTF-8" ).rstrip()
+
+    #----------------------------------------------------------------------------------------------
+    def GetExact( self, length: int, stayConnected=False, connIdx=0, timeout=None ) -> bytes:
+        res = self.__ReceiveWith( lambda: self.__ReceiveExact( length ), stayConnected, connIdx, timeout )
+        if( res == None ):
+            return b""
+        return res
+
+    #----------------------------------------------------------------------------------------------
+    def GetBlock( self, stayConnected=False, connIdx=0, terminated=True, timeout=None ) -> bytes:
+        #IEEE 488.2 definite length block: #<n><length><data>, terminated - line ending after data is removed
+        res = self.__ReceiveWith( lambda: self.__ReceiveBlock( terminated ), stayConnected, connIdx, timeout )
+        if( res == None ):
+            return b""
+        return res
+
     #----------------------------------------------------------------------------------------------
     def SendCommandGetAns( self, command, respondLength=1024, stayConnected=False, connIdx=0 ) -> str:
         connIdx = self.SendCommand( command, True, connIdx )
@@ -233,6 +381,20 @@ class SCPI_Socket:
             return []
         return self.GetRaw( respondLength=respondLength, stayConnected=stayConnected, connIdx=0 )
 
+    #----------------------------------------------------------------------------------------------
+    def SendCommandGetLine( self, command, stayConnected=False, connIdx=0, timeout=None ) -> str:
+        connIdx = self.SendCommand( command, True, connIdx )
+        if( connIdx == -1 ):
+            return ""
+        return self.GetLine( stayConnected=stayConnected, connIdx=connIdx, timeout=timeout )
+
+    #----------------------------------------------------------------------------------------------
+    def SendCommandGetBlock( self, command, stayConnected=False, connIdx=0, terminated=True, timeout=None ) -> bytes:
+        connIdx = self.SendCommand( command, True, connIdx )
+        if( connIdx == -1 ):
+            return b""
+        return self.GetBlock( stayConnected=stayConnected, connIdx=connIdx, terminated=terminated, timeout=timeout )
+
     
 
     
\ No newline at end of file
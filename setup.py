@@ -8,7 +8,7 @@ setup(
     author='Pawel Pudo',
     author_email='ppudo@outlook.com',
     url='https://github.com/ppudo/labtoys_python.git',
-    install_requires=[ 'pywin32==221' ],
+    install_requires=[ 'pywin32==221', 'numpy' ],
     packages=find_packages(),
     keywords=['scpi', 'rigol', 'ds1000z', 'delta elektronika', 'psc_eth', 'cts', 'ascii-protokolls',
                 'keysight', 'daq', '34972A', 'tektrinix', 'mso5', 'CANoe' ],